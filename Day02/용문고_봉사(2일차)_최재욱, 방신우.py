@@ -48,8 +48,12 @@ class PongEnv:
         self.ball2_delay = 2  # 두 번째 공 등장 딜레이(초)
         self.ball2_timer = 0.0
 
-        # 빨간 공 상태 변수 (여러 개)
-        self.red_balls = []  # 각 빨간 공: {'x':..., 'y':..., 'active':...}
+        # 빨간 공 상태 변수 (슬롯 풀, 비활성 슬롯은 재사용하고 가득 차면 두 배로 늘림)
+        self.red_ball_capacity = 16  # 처음 만들어 둘 슬롯 수
+        self.red_x = np.zeros(self.red_ball_capacity)
+        self.red_y = np.zeros(self.red_ball_capacity)
+        self.red_active = np.zeros(self.red_ball_capacity, dtype=bool)
+        self.red_balls_spawned = 0  # 지금까지 등장한 빨간 공 수
         self.red_ball_speed = 0.01
         self.red_ball_interval = 5  # 5점 간격 등장
         self.red_ball_start_score = 15
@@ -97,10 +101,19 @@ class PongEnv:
         self.misses = 0
 
         # 빨간 공 초기화
-        self.red_balls = []
+        self.red_active[:] = False
+        self.red_balls_spawned = 0
 
         return self._get_state()
 
+    def _grow_red_balls(self):
+        """빨간 공 풀 크기를 두 배로 (기존 공은 그대로, 새 슬롯은 비활성)"""
+        extra = self.red_ball_capacity
+        self.red_x = np.concatenate([self.red_x, np.zeros(extra)])
+        self.red_y = np.concatenate([self.red_y, np.zeros(extra)])
+        self.red_active = np.concatenate([self.red_active, np.zeros(extra, dtype=bool)])
+        self.red_ball_capacity += extra
+
     def step(self, action):
         """
         action:
@@ -190,21 +203,30 @@ class PongEnv:
         if self.score >= self.red_ball_start_score:
             # 등장해야 할 빨간공 개수
             num_red_balls = (self.score - self.red_ball_start_score) // self.red_ball_interval + 1
-            while len(self.red_balls) < num_red_balls:
+            while self.red_balls_spawned < num_red_balls:
                 # x 위치 랜덤, y=0에서 시작
                 ball_x = np.random.uniform(0.1, 0.9)
-                self.red_balls.append({'x': ball_x, 'y': 0.0, 'active': True})
-        # 빨간 공 이동
-        for ball in self.red_balls:
-            if ball['active']:
-                ball['y'] += self.red_ball_speed
-                # 패들 충돌 체크
-                if 0.95 <= ball['y'] <= 1.0:
-                    if abs(ball['x'] - self.paddle_x) <= self.paddle_width / 2:
-                        done = True
-                # 화면 아래로 벗어나면 비활성화
-                if ball['y'] > 1.0:
-                    ball['active'] = False
+                self.red_balls_spawned += 1
+                # 비어 있는 슬롯에 넣기 (풀이 가득 차면 늘려서 공을 빠뜨리지 않음)
+                free = np.flatnonzero(~self.red_active)
+                if free.size:
+                    slot = free[0]
+                else:
+                    slot = self.red_ball_capacity
+                    self._grow_red_balls()
+                self.red_x[slot] = ball_x
+                self.red_y[slot] = 0.0
+                self.red_active[slot] = True
+        # 빨간 공 이동 (활성 슬롯 전체를 한 번에)
+        live = self.red_active
+        if live.any():
+            np.add(self.red_y, self.red_ball_speed, out=self.red_y, where=live)
+            # 패들 충돌 체크
+            at_paddle = live & (self.red_y >= 0.95) & (self.red_y <= 1.0)
+            if np.any(at_paddle & (np.abs(self.red_x - self.paddle_x) <= self.paddle_width / 2)):
+                done = True
+            # 화면 아래로 벗어나면 비활성화 (슬롯 반납)
+            self.red_active &= self.red_y <= 1.0
 
         # 두 공 모두 놓쳐야 게임오버
         if self.ball1_missed and self.ball2_missed:
@@ -279,11 +301,10 @@ class PongEnv:
                             (ball2_pixel_x - 7, ball2_pixel_y - 7, 15, 15))
         
         # 빨간 공 렌더링
-        for ball in self.red_balls:
-            if ball['active']:
-                ball_pixel_x = int(ball['x'] * self.width)
-                ball_pixel_y = int(ball['y'] * self.height)
-                pygame.draw.circle(self.screen, (255, 0, 0), (ball_pixel_x, ball_pixel_y), 10)
+        for slot in np.flatnonzero(self.red_active):
+            ball_pixel_x = int(self.red_x[slot] * self.width)
+            ball_pixel_y = int(self.red_y[slot] * self.height)
+            pygame.draw.circle(self.screen, (255, 0, 0), (ball_pixel_x, ball_pixel_y), 10)
         
         # 점수 표시
         score_text = self.font.render(str(self.score), True, (255, 255, 255))
@@ -25,6 +25,17 @@ class PongAgent:
 
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
+        self.input_index = self.input_details[0]['index']
+        self.output_index = self.output_details[0]['index']
+        self.num_features = int(self.input_details[0]['shape'][1])
+        self.batch_size = int(self.input_details[0]['shape'][0])
+        # 출력 텐서를 복사 없이 읽는 함수 (반환된 배열은 invoke 전에 버려야 함)
+        self.output_tensor = self.interpreter.tensor(self.output_index)
+        self.last_batch_stats = None
+
+        # 환경의 관측값 버퍼를 [1, N] 모양으로 본 뷰 (같은 버퍼면 재사용)
+        self._state_source = None
+        self._input_view = None
 
         # Frame skip 설정
         self.frame_skip = frame_skip
@@ -48,25 +59,61 @@ class PongAgent:
 
         # Frame skip: N프레임마다 한 번만 추론
         if self.frame_count % self.frame_skip == 0:
-            # 입력 데이터 준비
-            input_data = np.array([state], dtype=np.float32)
+            # 입력 데이터 준비 (env 버퍼를 그대로 입력 텐서로 복사, 중간 배열 없음)
+            self._set_batch_size(1)
+            # 같은 버퍼를 가리키는 뷰일 때만 재사용 (float64/리스트처럼 복사된 입력은 매번 다시 변환)
+            if state is not self._state_source or not np.shares_memory(self._input_view, state):
+                self._state_source = state
+                self._input_view = np.asarray(state, dtype=np.float32).reshape(1, -1)
 
             # TFLite 추론
-            self.interpreter.set_tensor(
-                self.input_details[0]['index'],
-                input_data
-            )
+            self.interpreter.set_tensor(self.input_index, self._input_view)
             self.interpreter.invoke()
-            output = self.interpreter.get_tensor(
-                self.output_details[0]['index']
-            )
 
             # 행동 선택 (Q값이 가장 큰 행동)
-            self.last_action = np.argmax(output[0])
+            self.last_action = int(self.output_tensor()[0].argmax())
 
         # Skip된 프레임에서는 이전 행동 재사용
         return self.last_action
 
+    def _set_batch_size(self, batch_size):
+        """입력 텐서의 배치 크기 변경 (크기가 바뀔 때만 resize + allocate_tensors)"""
+        if batch_size == self.batch_size:
+            return
+        self.interpreter.resize_tensor_input(self.input_index, [batch_size, self.num_features])
+        self.interpreter.allocate_tensors()
+        self.batch_size = batch_size
+
+    def get_actions(self, states):
+        """
+        여러 상태를 한 번의 invoke로 추론 (Frame skip 없이 모두 추론)
+
+        Args:
+            states: numpy array [B, N] (B개의 상태)
+
+        Returns:
+            actions: [B] 행동 배열
+            q_values: [B, 3] Q값 배열
+        """
+        states = np.asarray(states, dtype=np.float32)
+        batch_size = states.shape[0]
+        self._set_batch_size(batch_size)
+
+        start_time = time.time()
+        self.interpreter.set_tensor(self.input_index, states)
+        self.interpreter.invoke()
+        q_values = self.interpreter.get_tensor(self.output_index)
+        actions = q_values.argmax(axis=1)
+        batch_time = (time.time() - start_time) * 1000  # ms
+
+        # 배치 전체 시간 + 샘플당 분할 시간
+        self.last_batch_stats = {
+            'batch_size': batch_size,
+            'batch_time': batch_time,
+            'per_sample_time': batch_time / batch_size,
+        }
+        return actions, q_values
+
 
 # ============================================
 # 사용 예시 (실제 게임 환경에 맞춰 수정)
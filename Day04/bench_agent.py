@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PongAgent 추론 속도 측정
+TFLite / NumPy 백엔드별로 상태 하나씩 추론(get_action)과 배치 추론(get_actions)의
+배치당 지연 시간과 샘플당 분할 지연 시간을 비교
+"""
+
+import os
+import time
+
+import numpy as np
+
+from fixed_timestep import FixedTimestep
+from pong_vec_env import PongVecEnv
+from run_game import PongAgent, play_episodes
+from wlqrkrhtlvek1 import PongEnv
+
+
+def sample_states(num_states, seed=0):
+    """실제 게임에서 나오는 관측값 num_states개 수집 (랜덤 행동)"""
+    env = PongVecEnv(num_states)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        states, reward, done, info = env.step(rng.integers(0, env.action_space_n, size=num_states))
+    return states
+
+
+def measure_single(agent, states):
+    """상태 하나씩 get_action으로 추론했을 때 샘플당 지연 시간(ms)"""
+    agent.frame_skip = 1
+    start_time = time.perf_counter()
+    for state in states:
+        agent.get_action(state)
+    return (time.perf_counter() - start_time) * 1000 / len(states)
+
+
+def measure_batch(agent, states, batch_size, repeats=20):
+    """get_actions 배치 추론의 (배치당 지연 시간, 샘플당 지연 시간) (ms)"""
+    batch = states[:batch_size]
+    agent.get_actions(batch)  # 배치 크기 변경(resize) 비용은 측정에서 제외
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        agent.get_actions(batch)
+    batch_time = (time.perf_counter() - start_time) * 1000 / repeats
+    return batch_time, batch_time / batch_size
+
+
+def check_adaptive_timestep(model_path, seconds=2.0, render_fps=30):
+    """
+    --adaptive-skip + --render-fps(화면이 시뮬레이션보다 느림) 조합 확인
+    화면 프레임마다 step을 몰아서 실행해도 데드라인 초과로 잘못 세지 않아야 함
+    (창 없이 SDL dummy 드라이버로 실행, 게임 루프가 멈추지 않으면 frame skip이 max_skip까지 가지 않음)
+    
+    반환값: 게임을 마친 PongAgent
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env = PongEnv(render_mode='human', render_fps=render_fps)
+    agent = PongAgent(model_path=model_path, frame_skip=1, backend='numpy',
+                      adaptive_skip=True, target_fps=env.target_fps)
+    play_episodes(agent, env, max_episodes=1, render_mode='human',
+                  timestep=FixedTimestep(sim_fps=env.target_fps), seed=0,
+                  max_frames=int(seconds * env.target_fps))
+    env.close()
+    return agent
+
+
+if __name__ == "__main__":
+    MODEL_PATH = 'pong_model.tflite'
+    BACKENDS = ['tflite', 'numpy']
+    BATCH_SIZES = [1, 8, 64, 512, 4096]
+
+    agents = {backend: PongAgent(model_path=MODEL_PATH, frame_skip=1, backend=backend)
+              for backend in BACKENDS}
+    states = sample_states(max(BATCH_SIZES))
+
+    for backend, agent in agents.items():
+        single = measure_single(agent, states[:1000])
+        print(f"\n[{backend}] get_action 1개씩: {single * 1000:.1f} us/샘플")
+
+        print(f"{'배치 크기':>10}{'배치당(ms)':>14}{'샘플당(us)':>14}{'속도 향상':>10}")
+        print("─" * 50)
+        for batch_size in BATCH_SIZES:
+            batch_time, per_sample = measure_batch(agent, states, batch_size)
+            print(f"{batch_size:>10}{batch_time:>14.3f}{per_sample * 1000:>14.2f}{single / per_sample:>9.1f}x")
+
+    # 백엔드끼리 같은 행동을 고르는지 확인 (TFLite는 입력을 int8로 양자화해서 계산)
+    if len(agents) > 1:
+        actions = {backend: agent.get_actions(states)[0] for backend, agent in agents.items()}
+        reference = actions[BACKENDS[0]]
+        for backend in BACKENDS[1:]:
+            agreement = np.mean(actions[backend] == reference) * 100
+            print(f"\n{BACKENDS[0]} vs {backend} 행동 일치율: {agreement:.2f}%")
+
+    # 적응형 frame skip + 느린 화면(FixedTimestep) 조합에서 데드라인을 화면 프레임 단위로 재는지 확인
+    agent = check_adaptive_timestep(MODEL_PATH)
+    print(f"\n적응형 skip + 화면 30 FPS: frame_skip {agent.frame_skip} (최대 {agent.max_skip}), "
+          f"데드라인 초과 {agent.missed_deadlines}회")
+    assert agent.frame_skip < agent.max_skip, "화면 프레임 사이 대기 시간을 데드라인 초과로 셈"
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PongEnv 헤드리스 속도 측정
+기존 PongEnv와 FastPongEnv의 steps/sec를 비교하고,
+같은 시드에서 두 엔진의 궤적이 완전히 같은지 확인
+advance_until_event(이벤트 단위 건너뛰기)로 시뮬레이션한 프레임/초도 함께 출력
+"""
+
+import time
+
+from wlqrkrhtlvek1 import PongEnv, FastPongEnv
+
+
+def tracking_action(state):
+    """공(첫 번째 공)을 따라가는 간단한 규칙 에이전트 (긴 게임을 만들기 위함)"""
+    ball_x, paddle_x = state[0], state[4]
+    if ball_x < paddle_x - 0.05:
+        return 0
+    if ball_x > paddle_x + 0.05:
+        return 2
+    return 1
+
+
+def run_trajectory(env_cls, seed, num_steps):
+    """시드를 고정하고 num_steps 동안 진행한 (state, reward, done) 기록 반환"""
+    env = env_cls()
+    state = env.reset(seed=seed)
+    trajectory = []
+    for _ in range(num_steps):
+        state, reward, done, info = env.step(tracking_action(state))
+        trajectory.append((state.tobytes(), reward, done, info['score']))
+        if done:
+            state = env.reset()
+    return trajectory
+
+
+def check_advance_until_event(env_cls, seed, num_events):
+    """
+    advance_until_event와 step을 같은 행동으로 같은 프레임 수만큼 반복한 결과가
+    이벤트마다 비트 단위로 같은지 확인 (한 에피소드가 끝나면 거기서 멈춤)
+    """
+    fast_env = env_cls()
+    step_env = env_cls()
+    state = fast_env.reset(seed=seed)
+    step_env.reset(seed=seed)
+    for _ in range(num_events):
+        action = tracking_action(state)
+        state, reward, done, info = fast_env.advance_until_event(action)
+        total_reward = 0.0
+        for _ in range(info['frames']):
+            step_state, step_reward, step_done, step_info = step_env.step(action)
+            total_reward += step_reward
+        if (state.tobytes() != step_state.tobytes() or reward != total_reward
+                or done != step_done or info['score'] != step_info['score']):
+            return False
+        if done:
+            break
+    return True
+
+
+def measure_steps_per_sec(env_cls, num_steps):
+    """num_steps 동안 step을 반복한 처리량(steps/sec)"""
+    env = env_cls()
+    state = env.reset()
+    start_time = time.perf_counter()
+    for _ in range(num_steps):
+        state, reward, done, info = env.step(tracking_action(state))
+        if done:
+            state = env.reset()
+    return num_steps / (time.perf_counter() - start_time)
+
+
+def measure_event_frames_per_sec(env_cls, num_events):
+    """advance_until_event를 num_events번 호출하는 동안 시뮬레이션된 프레임/초"""
+    env = env_cls()
+    state = env.reset()
+    frames = 0
+    start_time = time.perf_counter()
+    for _ in range(num_events):
+        state, reward, done, info = env.advance_until_event(tracking_action(state))
+        frames += info['frames']
+        if done:
+            state = env.reset()
+    return frames / (time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    NUM_STEPS = 200000
+    SEED = 0
+
+    same = run_trajectory(PongEnv, SEED, 20000) == run_trajectory(FastPongEnv, SEED, 20000)
+    print(f"같은 시드 궤적 일치: {'예' if same else '아니오'}")
+    same = all(check_advance_until_event(env_cls, seed, 500)
+               for env_cls in (PongEnv, FastPongEnv) for seed in range(20))
+    print(f"advance_until_event == step 반복: {'예' if same else '아니오'}")
+
+    print(f"\n{'엔진':<14}{'steps/sec':>14}")
+    print("─" * 28)
+    base = measure_steps_per_sec(PongEnv, NUM_STEPS)
+    fast = measure_steps_per_sec(FastPongEnv, NUM_STEPS)
+    print(f"{'PongEnv':<14}{base:>14,.0f}")
+    print(f"{'FastPongEnv':<14}{fast:>14,.0f}   (x{fast / base:.1f})")
+
+    # 이벤트 사이 프레임을 건너뛰는 모드 (이벤트 때만 행동을 고름)
+    event = measure_event_frames_per_sec(FastPongEnv, NUM_STEPS // 10)
+    print(f"{'fast-forward':<14}{event:>14,.0f}   (x{event / base:.1f}, 시뮬레이션 프레임/초)")
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pong 성능 측정 모음 (환경 / 추론 / 전체 프레임)
+결과를 JSON으로 저장하고, 저장해 둔 기준(baseline) 결과와 비교해서 느려진 항목을 찾음
+
+사용 예:
+    python benchmark.py --output results.json                 # 측정 + 저장
+    python benchmark.py --save-baseline baseline.json         # 기준 결과 저장
+    python benchmark.py --baseline baseline.json --threshold 0.1
+    python benchmark.py --cpus 0,1 --groups inference         # 라즈베리파이처럼 코어 2개로 제한
+    python benchmark.py --groups render                       # 화면 그리기 (human / 바뀐 영역만 / rgb_array)
+    python benchmark.py --groups replay                       # 리플레이 버퍼 (100만 개, 균등 / 우선순위)
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from bench_env import tracking_action
+from pong_vec_env import PongVecEnv
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from wlqrkrhtlvek1 import PongEnv, FastPongEnv
+
+DAY02_ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              '..', 'Day02', '용문고_봉사(2일차)_최재욱, 방신우.py')
+MODEL_PATH = 'pong_model.tflite'
+
+
+def load_day02_env():
+    """Day02 PongEnv(두 번째 공 + 빨간 공) 클래스 불러오기 (파일 이름에 공백/쉼표가 있어서 경로로 import)"""
+    spec = importlib.util.spec_from_file_location('day02_pong', DAY02_ENV_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PongEnv
+
+
+# ====================================================================
+# 환경 (헤드리스 steps/sec)
+# ====================================================================
+def make_env(env_cls, ball2=True, red_balls=None):
+    """
+    환경 생성
+
+    Args:
+        ball2: False면 두 번째 공이 나오지 않게 함 (등장 딜레이 무한대)
+        red_balls: True면 빨간 공이 처음부터 1점마다 등장, False면 나오지 않음 (Day02만)
+    """
+    env = env_cls()
+    if not ball2:
+        env.ball2_delay = float('inf')
+    if red_balls is True:
+        env.red_ball_start_score = 0
+        env.red_ball_interval = 1
+    elif red_balls is False:
+        env.red_ball_start_score = float('inf')
+    return env
+
+
+def measure_env(env, num_steps):
+    """공을 따라가는 에이전트로 num_steps 진행한 steps/sec"""
+    np.random.seed(0)  # Day02 환경은 전역 난수 사용
+    state = env.reset(seed=0) if isinstance(env, PongEnv) else env.reset()  # Day04는 환경별 시드
+    start_time = time.perf_counter()
+    for _ in range(num_steps):
+        state, reward, done, info = env.step(tracking_action(state))
+        if done:
+            state = env.reset()
+    return num_steps / (time.perf_counter() - start_time)
+
+
+def measure_vec_env(num_envs, num_steps):
+    """PongVecEnv의 전체 steps/sec (게임 수 x 스텝)"""
+    env = PongVecEnv(num_envs)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, env.action_space_n, size=(num_steps, num_envs))
+    start_time = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    return num_envs * num_steps / (time.perf_counter() - start_time)
+
+
+def env_cases(scale):
+    """(이름, 측정 함수, 단위, 클수록 좋은지) 리스트"""
+    steps = int(100000 * scale)
+    day02 = load_day02_env()
+    cases = [
+        ('env/day02_ball2_red', lambda: measure_env(make_env(day02, red_balls=True), steps)),
+        ('env/day02_ball2', lambda: measure_env(make_env(day02, red_balls=False), steps)),
+        ('env/day02_single_ball', lambda: measure_env(make_env(day02, ball2=False, red_balls=False), steps)),
+        ('env/day04_ball2', lambda: measure_env(make_env(PongEnv), steps)),
+        ('env/day04_single_ball', lambda: measure_env(make_env(PongEnv, ball2=False), steps)),
+        ('env/day04_fast_ball2', lambda: measure_env(make_env(FastPongEnv), steps)),
+        ('env/day04_fast_single_ball', lambda: measure_env(make_env(FastPongEnv, ball2=False), steps)),
+        ('env/day04_vec_4096', lambda: measure_vec_env(4096, max(10, int(200 * scale)))),
+    ]
+    return [(name, fn, 'steps/s', True) for name, fn in cases]
+
+
+# ====================================================================
+# 추론 (TFLite num_threads별 단일 지연 시간 / 배치 처리량)
+# ====================================================================
+def make_agent(frame_skip=1, **kwargs):
+    """PongAgent 생성 (초기화 메시지는 숨김)"""
+    from run_game import PongAgent
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PongAgent(model_path=MODEL_PATH, frame_skip=frame_skip, **kwargs)
+
+
+def sample_states(num_states):
+    """실제 게임 관측값 num_states개 (랜덤 행동)"""
+    env = PongVecEnv(num_states)
+    states = env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        states, reward, done, info = env.step(rng.integers(0, env.action_space_n, size=num_states))
+    return states
+
+
+def measure_single_latency(agent, states):
+    """get_action 하나의 지연 시간 중앙값 (us)"""
+    times = np.empty(len(states))
+    for i, state in enumerate(states):
+        start_time = time.perf_counter()
+        agent.get_action(state)
+        times[i] = time.perf_counter() - start_time
+    return float(np.median(times) * 1e6)
+
+
+def measure_batch_throughput(agent, states, repeats):
+    """get_actions 배치 추론 처리량 (samples/sec)"""
+    agent.get_actions(states)  # 배치 크기 변경 비용 제외
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        agent.get_actions(states)
+    return len(states) * repeats / (time.perf_counter() - start_time)
+
+
+def inference_cases(scale, threads):
+    """
+    (이름, 측정 함수, 단위, 클수록 좋은지) 리스트
+    tflite_runtime/tensorflow가 없으면 TFLite 항목은 경고만 하고 빼고 NumPy 항목만 측정
+    """
+    from run_game import load_inference_backend
+    states = sample_states(4096)
+    single = states[:max(100, int(5000 * scale))]
+    repeats = max(2, int(50 * scale))
+    cases = []
+    try:
+        load_inference_backend('tflite')
+    except ImportError as e:
+        print(f" 경고: {e} TFLite 추론 항목은 건너뜁니다.")
+        threads = []
+    for num_threads in threads:
+        def single_case(num_threads=num_threads):
+            return measure_single_latency(make_agent(backend='tflite', num_threads=num_threads), single)
+
+        def batch_case(batch_size, num_threads=num_threads):
+            agent = make_agent(backend='tflite', num_threads=num_threads)
+            return measure_batch_throughput(agent, states[:batch_size], repeats)
+
+        cases.append((f'inference/tflite_t{num_threads}_single', single_case, 'us', False))
+        for batch_size in (64, 4096):
+            cases.append((f'inference/tflite_t{num_threads}_batch{batch_size}',
+                          lambda b=batch_size, f=batch_case: f(b), 'samples/s', True))
+    cases.append(('inference/numpy_single',
+                  lambda: measure_single_latency(make_agent(backend='numpy'), single), 'us', False))
+    cases.append(('inference/numpy_batch4096',
+                  lambda: measure_batch_throughput(make_agent(backend='numpy'), states, repeats),
+                  'samples/s', True))
+    return cases
+
+
+# ====================================================================
+# 전체 프레임 (run_game 게임 루프를 화면 없이)
+# ====================================================================
+def measure_game_loop(agent, env_cls, num_frames):
+    """run_game.py 게임 루프(play_episodes)를 화면 없이 num_frames 돌린 frames/sec"""
+    from run_game import play_episodes
+    env = env_cls()
+    with contextlib.redirect_stdout(io.StringIO()):  # 에피소드 메시지 숨김
+        start_time = time.perf_counter()
+        result = play_episodes(agent, env, max_episodes=num_frames, seed=0, max_frames=num_frames)
+        elapsed = time.perf_counter() - start_time
+    return result['total_frames'] / elapsed
+
+
+def e2e_cases(scale):
+    """
+    (이름, 측정 함수, 단위, 클수록 좋은지) 리스트
+    PongAgent 기본 백엔드(auto)로 측정하므로 실제로 쓴 백엔드는 결과 meta의 e2e_backend에 기록
+    """
+    frames = int(50000 * scale)
+    cases = [
+        ('e2e/run_game_skip4', lambda: measure_game_loop(make_agent(frame_skip=4), PongEnv, frames)),
+        ('e2e/run_game_skip1', lambda: measure_game_loop(make_agent(frame_skip=1), PongEnv, frames)),
+        ('e2e/run_game_fast_skip4', lambda: measure_game_loop(make_agent(frame_skip=4), FastPongEnv, frames)),
+    ]
+    return [(name, fn, 'frames/s', True) for name, fn in cases]
+
+
+# ====================================================================
+# 화면 그리기 (화면이 없으면 SDL dummy 드라이버)
+# ====================================================================
+def measure_render(num_frames, warmup=300, **env_kwargs):
+    """
+    공 2개가 나온 게임에서 render()만 잰 frames/sec
+    clock.tick 대기는 빼고 그리기 + 화면 갱신(rgb_array는 이미지 복사)만 측정
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env = PongEnv(target_fps=120, **env_kwargs)
+    env.clock = None
+    state = env.reset(seed=0)
+    for _ in range(warmup):  # 두 번째 공이 나올 때까지 진행
+        state, reward, done, info = env.step(tracking_action(state))
+    elapsed = 0.0
+    for _ in range(num_frames):
+        state, reward, done, info = env.step(tracking_action(state))
+        if done:
+            state = env.reset()
+        start_time = time.perf_counter()
+        env.render()
+        elapsed += time.perf_counter() - start_time
+    env.close()
+    return num_frames / elapsed
+
+
+def render_cases(scale):
+    """(이름, 측정 함수, 단위, 클수록 좋은지) 리스트"""
+    frames = int(5000 * scale)
+    cases = [
+        ('render/human', lambda: measure_render(frames, render_mode='human')),
+        ('render/human_dirty_rects', lambda: measure_render(frames, render_mode='human', dirty_rects=True)),
+        ('render/rgb_array', lambda: measure_render(frames, render_mode='rgb_array')),
+        ('render/rgb_array_84x84', lambda: measure_render(frames, render_mode='rgb_array', render_size=(84, 84))),
+    ]
+    return [(name, fn, 'frames/s', True) for name, fn in cases]
+
+
+# ====================================================================
+# 리플레이 버퍼 (용량 100만 개를 채운 상태에서 배치 연산 1회 시간)
+# ====================================================================
+REPLAY_CAPACITY = 1_000_000
+REPLAY_BATCH = 64
+_replay_buffers = {}
+
+
+def filled_buffer(buffer_cls):
+    """가득 찬 버퍼 (처음 한 번만 만들고 재사용, 우선순위는 임의 값)"""
+    if buffer_cls not in _replay_buffers:
+        rng = np.random.default_rng(0)
+        buffer = buffer_cls(REPLAY_CAPACITY, batch_size=REPLAY_BATCH, seed=0)
+        chunk = 4096
+        for _ in range(0, REPLAY_CAPACITY, chunk):
+            states = rng.random((chunk, 10), dtype=np.float32)
+            buffer.add(states, rng.integers(0, 3, size=chunk), rng.random(chunk), states, rng.random(chunk) < 0.01)
+        if isinstance(buffer, PrioritizedReplayBuffer):
+            buffer.update_priorities(np.arange(REPLAY_CAPACITY), rng.exponential(size=REPLAY_CAPACITY))
+        _replay_buffers[buffer_cls] = buffer
+    return _replay_buffers[buffer_cls]
+
+
+def measure_op(fn, num_ops):
+    """fn() 1회 평균 시간 (us)"""
+    start_time = time.perf_counter()
+    for _ in range(num_ops):
+        fn()
+    return (time.perf_counter() - start_time) / num_ops * 1e6
+
+
+def replay_cases(scale):
+    """(이름, 측정 함수, 단위, 클수록 좋은지) 리스트"""
+    ops = max(int(2000 * scale), 1)
+    rng = np.random.default_rng(1)
+    td_errors = rng.normal(size=REPLAY_BATCH)
+    states = rng.random((1024, 10), dtype=np.float32)
+
+    def per_update():
+        buffer = filled_buffer(PrioritizedReplayBuffer)
+        indices = buffer.sample()[-1]
+        buffer.update_priorities(indices, td_errors)
+
+    def naive_choice():
+        # 비교용: 우선순위 배열 전체를 정규화해서 np.random.choice (O(N))
+        buffer = filled_buffer(PrioritizedReplayBuffer)
+        priorities = buffer.tree[buffer.tree_size:buffer.tree_size + REPLAY_CAPACITY]
+        rng.choice(REPLAY_CAPACITY, size=REPLAY_BATCH, p=priorities / priorities.sum())
+
+    cases = [
+        ('replay/uniform_sample_64', lambda: measure_op(filled_buffer(ReplayBuffer).sample, ops)),
+        ('replay/per_sample_64', lambda: measure_op(filled_buffer(PrioritizedReplayBuffer).sample, ops)),
+        ('replay/per_sample_update_64', lambda: measure_op(per_update, ops)),
+        ('replay/per_add_1024', lambda: measure_op(
+            lambda: filled_buffer(PrioritizedReplayBuffer).add(states, 1, 0.0, states, False), ops)),
+        ('replay/naive_choice_64', lambda: measure_op(naive_choice, max(ops // 100, 1))),
+    ]
+    return [(name, fn, 'us/op', False) for name, fn in cases]
+
+
+# ====================================================================
+# 실행 / 저장 / 기준 결과 비교
+# ====================================================================
+def set_cpu_affinity(cpus):
+    """이 프로세스를 지정한 CPU 코어에서만 실행 (라즈베리파이처럼 코어 수 제한, Linux 전용)"""
+    if not hasattr(os, 'sched_setaffinity'):
+        print(" 경고: 이 OS에서는 CPU affinity를 설정할 수 없습니다.")
+        return None
+    os.sched_setaffinity(0, cpus)
+    return sorted(os.sched_getaffinity(0))
+
+
+def run_cases(cases, repeats):
+    """각 항목을 repeats번 측정해서 가장 좋은 값을 기록"""
+    results = {}
+    for name, fn, unit, higher_is_better in cases:
+        values = [fn() for _ in range(repeats)]
+        value = max(values) if higher_is_better else min(values)
+        results[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f"   {name:<34}{value:>16,.2f} {unit}")
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    기준 결과와 비교해서 threshold(비율)보다 나빠진 항목 이름 리스트 반환
+
+    나빠진 정도: 클수록 좋은 값은 (기준 - 현재) / 기준, 작을수록 좋은 값은 (현재 - 기준) / 기준
+    """
+    print(f"\n{'항목':<34}{'기준':>14}{'현재':>14}{'변화':>9}")
+    print("─" * 72)
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['value'], result['value']
+        change = (after - before) / before
+        worse = -change if result['higher_is_better'] else change
+        mark = ''
+        if worse > threshold:
+            regressions.append(name)
+            mark = '  ← 느려짐'
+        print(f"{name:<34}{before:>14,.2f}{after:>14,.2f}{change * 100:>+8.1f}%{mark}")
+    return regressions
+
+
+def parse_args(argv=None):
+    """명령행 옵션"""
+    parser = argparse.ArgumentParser(description="Pong 성능 측정 (환경 / 추론 / 전체 프레임)")
+    parser.add_argument('--groups', default='env,inference,e2e',
+                        help="측정할 그룹 (쉼표로 구분, env/inference/e2e/render/replay, 기본값: env,inference,e2e)")
+    parser.add_argument('--threads', default='1,2,4', help="TFLite num_threads 값들 (기본값: 1,2,4)")
+    parser.add_argument('--cpus', default=None, help="사용할 CPU 코어 번호 (예: 0,1 → 코어 2개로 제한)")
+    parser.add_argument('--scale', type=float, default=1.0, help="측정 길이 배율 (0.1이면 빠르게)")
+    parser.add_argument('--repeats', type=int, default=3, help="항목별 반복 횟수 (가장 좋은 값 사용)")
+    parser.add_argument('--output', default=None, help="결과 JSON 저장 경로")
+    parser.add_argument('--save-baseline', default=None, metavar='PATH', help="결과를 기준 결과로 저장")
+    parser.add_argument('--baseline', default=None, metavar='PATH', help="비교할 기준 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="이 비율보다 나빠지면 느려진 것으로 판단 (기본값: 0.1 = 10%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    cpus = None
+    if args.cpus:
+        cpus = set_cpu_affinity({int(cpu) for cpu in args.cpus.split(',')})
+    threads = [int(n) for n in args.threads.split(',')]
+    groups = args.groups.split(',')
+
+    cases = []
+    e2e_backend = None
+    if 'env' in groups:
+        cases += env_cases(args.scale)
+    if 'inference' in groups:
+        cases += inference_cases(args.scale, threads)
+    if 'e2e' in groups:
+        from run_game import load_inference_backend
+        e2e_backend = load_inference_backend('auto')[0]  # 설치된 라이브러리에 따라 달라짐
+        print(f" 전체 프레임 추론 백엔드: {e2e_backend}")
+        cases += e2e_cases(args.scale)
+    if 'render' in groups:
+        cases += render_cases(args.scale)
+    if 'replay' in groups:
+        cases += replay_cases(args.scale)
+
+    print(f"\n 측정 항목 {len(cases)}개 (CPU: {cpus if cpus else '제한 없음'}, 반복 {args.repeats}회)")
+    print("─" * 72)
+    results = run_cases(cases, args.repeats)
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpus': cpus,
+            'scale': args.scale,
+            'repeats': args.repeats,
+            'e2e_backend': e2e_backend,
+        },
+        'results': results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"\n 결과 저장: {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        baseline_backend = baseline['meta'].get('e2e_backend')
+        if e2e_backend and baseline_backend and baseline_backend != e2e_backend:
+            print(f"\n 경고: 기준 결과의 전체 프레임 백엔드({baseline_backend})가 지금({e2e_backend})과 다릅니다.")
+        regressions = compare_with_baseline(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n 기준보다 {args.threshold * 100:.0f}% 넘게 느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+            return 1
+        print(f"\n 기준 대비 {args.threshold * 100:.0f}% 넘게 느려진 항목 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고정 Frame skip vs 이벤트 기반 추론 비교 (헤드리스)
+같은 시드의 게임을 두 방식으로 진행하고 점수와 추론 횟수를 나란히 출력
+"""
+
+from run_game import PongAgent
+from wlqrkrhtlvek1 import FastPongEnv
+
+
+def run_episodes(agent, seeds, max_frames):
+    """시드별로 한 에피소드씩 진행해서 점수 리스트 반환 (max_frames에서 끊음)"""
+    env = FastPongEnv()
+    scores = []
+    for seed in seeds:
+        state = env.reset(seed=seed)
+        agent.reset_episode()
+        score = 0
+        for _ in range(max_frames):
+            state, reward, done, info = env.step(agent.get_action(state))
+            score = info['score']
+            if done:
+                break
+        scores.append(score)
+    return scores
+
+
+if __name__ == "__main__":
+    MODEL_PATH = 'pong_model.tflite'
+    SEEDS = range(20)
+    MAX_FRAMES = 20000
+
+    configs = [
+        ('skip 1', dict(frame_skip=1)),
+        ('skip 4', dict(frame_skip=4)),
+        ('skip 8', dict(frame_skip=8)),
+        ('event', dict(inference_mode='event')),
+    ]
+
+    results = []
+    for name, kwargs in configs:
+        agent = PongAgent(model_path=MODEL_PATH, **kwargs)
+        scores = run_episodes(agent, SEEDS, MAX_FRAMES)
+        stats = agent.get_stats()
+        results.append((name, scores, stats))
+
+    print(f"\n{'방식':<10}{'평균 점수':>10}{'총 프레임':>12}{'추론 횟수':>12}{'추론 비율':>10}")
+    print("─" * 54)
+    for name, scores, stats in results:
+        ratio = stats['total_inferences'] / stats['total_frames'] * 100
+        print(f"{name:<10}{sum(scores) / len(scores):>10.2f}{stats['total_frames']:>12}"
+              f"{stats['total_inferences']:>12}{ratio:>9.1f}%")
+
+    for name, scores, stats in results:
+        if 'trigger_counts' in stats:
+            print(f"\n[{name}] 추론 이유: {stats['trigger_counts']}")
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PongEnv DQN 학습 (actor 프로세스 여러 개 + learner 1개)
+
+actor: 각자 FastPongEnv를 진행하면서 정책 가중치 사본(NumpyQNet)으로 epsilon-greedy 행동 선택
+       전이는 shared memory 블록에 직접 쓰고, 큐로는 블록 번호만 보냄 (전이를 pickle하지 않음)
+learner: 채워진 블록을 리플레이 버퍼로 옮기고 PyTorch(CPU)로 배치 학습,
+         몇 번 학습할 때마다 가중치를 shared memory에 써서 actor들이 가져가게 함
+
+사용 예:
+    python dqn_trainer.py --actors 4 --duration 600 --output pong_model_dqn.pth
+    python dqn_trainer.py --scaling 1,2,4,8 --duration 30    # actor 수별 steps/sec, updates/sec 비교
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from numpy_qnet import NumpyQNet
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+
+OBSERVATION_SIZE = 10  # PongEnv 관측값 크기
+LAYER_SIZES = (OBSERVATION_SIZE, 128, 128, 3)  # QNet: 입력 → 128 → 128 → 행동 3개
+
+
+def weight_views(flat, sizes=LAYER_SIZES):
+    """
+    평평한 float32 배열을 [(W [입력, 출력], b), ...] 레이어별 뷰로 나눔 (복사 없음)
+    NumpyQNet 레이어와 같은 모양 (PyTorch Linear 가중치의 전치)
+    """
+    views = []
+    offset = 0
+    for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+        W = flat[offset:offset + n_in * n_out].reshape(n_in, n_out)
+        offset += n_in * n_out
+        b = flat[offset:offset + n_out]
+        offset += n_out
+        views.append((W, b))
+    return views
+
+
+def num_weights(sizes=LAYER_SIZES):
+    return sum(n_in * n_out + n_out for n_in, n_out in zip(sizes[:-1], sizes[1:]))
+
+
+class SharedWeights:
+    """
+    learner → actor 정책 가중치 (shared memory)
+
+    앞 8바이트는 버전 번호: 쓰는 동안은 홀수, 다 쓰면 짝수 (seqlock)
+    actor는 읽기 전후 버전이 같고 짝수일 때만 읽은 값을 사용
+    """
+
+    def __init__(self, name=None, sizes=LAYER_SIZES):
+        size = 8 + 4 * num_weights(sizes)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.version = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self.flat = np.ndarray((num_weights(sizes),), dtype=np.float32, buffer=self.shm.buf, offset=8)
+        self.layers = weight_views(self.flat, sizes)
+
+    def publish(self, model):
+        """PyTorch QNet 가중치를 shared memory에 씀"""
+        self.version[0] += 1  # 쓰는 중 (홀수)
+        linears = [model.fc1, model.fc2, model.fc3]
+        for (W, b), linear in zip(self.layers, linears):
+            W[...] = linear.weight.detach().numpy().T
+            b[...] = linear.bias.detach().numpy()
+        self.version[0] += 1  # 다 씀 (짝수)
+
+    def read_into(self, out, last_version):
+        """
+        새 버전이 있으면 out(평평한 float32 배열)에 복사하고 그 버전을 반환 (없거나 쓰는 중이면 None)
+        """
+        version = int(self.version[0])
+        if version == last_version or version % 2 == 1:
+            return None
+        np.copyto(out, self.flat)
+        if int(self.version[0]) != version:  # 복사하는 동안 learner가 썼으면 다음에 다시
+            return None
+        return version
+
+    def close(self):
+        self.version = self.flat = self.layers = None  # 뷰를 먼저 놓아야 close 가능
+        self.shm.close()
+
+
+class TransitionBlocks:
+    """
+    actor 하나의 전이 블록 묶음 (shared memory)
+    블록(slot) 하나에 block_size개의 전이를 필드별 배열로 저장
+    """
+
+    FIELDS = ReplayBuffer.FIELDS
+
+    def __init__(self, num_slots, block_size, name=None):
+        self.num_slots = num_slots
+        self.block_size = block_size
+        shapes = {}
+        size = 0
+        for field, (dtype, columns) in self.FIELDS.items():
+            shape = (num_slots, block_size, OBSERVATION_SIZE) if columns else (num_slots, block_size)
+            shapes[field] = (shape, dtype, size)
+            size += int(np.prod(shape)) * np.dtype(dtype).itemsize
+            size += -size % 8  # 다음 필드를 8바이트 경계에 맞춤
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.arrays = {field: np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+                       for field, (shape, dtype, offset) in shapes.items()}
+
+    def slot(self, index):
+        """블록 하나의 필드별 뷰 {'states': [block_size, 10], ...}"""
+        return {field: array[index] for field, array in self.arrays.items()}
+
+    def close(self):
+        self.arrays = None
+        self.shm.close()
+
+
+# ====================================================================
+# actor 프로세스
+# ====================================================================
+def actor_main(actor_id, config, weights_name, blocks_name, stats_name, filled_queue, free_queue, stop_event,
+               errors):
+    """
+    actor 프로세스 진입점
+    에러가 나면 내용을 errors 큐로 보내고 종료 (learner는 actor가 종료된 것을 보고 바로 멈춤)
+    """
+    try:
+        _actor_loop(actor_id, config, weights_name, blocks_name, stats_name, filled_queue, free_queue, stop_event)
+    except Exception:
+        errors.put((actor_id, traceback.format_exc()))
+
+
+def _actor_loop(actor_id, config, weights_name, blocks_name, stats_name, filled_queue, free_queue, stop_event):
+    """
+    FastPongEnv를 진행하면서 빈 블록을 전이로 채워 learner에게 보냄
+
+    Args:
+        config: epsilon/블록 설정 딕셔너리 (make_config 참고)
+        weights_name, blocks_name, stats_name: shared memory 이름
+        filled_queue: (actor_id, 블록 번호) → learner
+        free_queue: learner가 다 쓴 블록 번호 → 이 actor
+        stop_event: 설정되면 종료
+    """
+    from wlqrkrhtlvek1 import FastPongEnv
+
+    weights = SharedWeights(weights_name)
+    blocks = TransitionBlocks(config['num_slots'], config['block_size'], blocks_name)
+    stats_shm = shared_memory.SharedMemory(name=stats_name)
+    # actor별 [env step 수, 끝난 에피소드 수, 에피소드 점수 합]
+    stats = np.ndarray((config['num_actors'], 3), dtype=np.int64, buffer=stats_shm.buf)[actor_id]
+
+    # 가중치 사본: NumpyQNet 레이어가 local 배열의 뷰라서 local만 덮어쓰면 정책이 바뀜
+    local = np.zeros(num_weights(), dtype=np.float32)
+    layers = weight_views(local)
+    qnet = NumpyQNet([(W, b, i < len(layers) - 1) for i, (W, b) in enumerate(layers)])
+    version = None
+    while version is None and not stop_event.is_set():
+        version = weights.read_into(local, 0)
+        time.sleep(0.001)
+
+    env = FastPongEnv()
+    rng = np.random.default_rng(config['seed'] + actor_id)
+    state = np.empty(OBSERVATION_SIZE, dtype=np.float32)
+    np.copyto(state, env.reset(seed=config['seed'] + actor_id))
+    state_batch = state.reshape(1, -1)
+    episode_score = 0
+    steps = 0
+    epsilon_start, epsilon_final, epsilon_decay = (config['epsilon_start'], config['epsilon_final'],
+                                                   config['epsilon_decay'])
+    block = states = actions = rewards = next_states = dones = None
+
+    while not stop_event.is_set():
+        try:
+            index = free_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        block = blocks.slot(index)
+        states, actions, rewards = block['states'], block['actions'], block['rewards']
+        next_states, dones = block['next_states'], block['dones']
+
+        for i in range(blocks.block_size):
+            epsilon = max(epsilon_final, epsilon_start - (epsilon_start - epsilon_final) * steps / epsilon_decay)
+            if rng.random() < epsilon:
+                action = int(rng.integers(0, 3))
+            else:
+                action = int(qnet.forward(state_batch)[0].argmax())
+
+            states[i] = state
+            next_state, reward, done, info = env.step(action, out=next_states[i])
+            actions[i] = action
+            rewards[i] = reward
+            dones[i] = done
+            steps += 1
+
+            if done:
+                episode_score = info['score']
+                stats[1] += 1
+                stats[2] += episode_score
+                np.copyto(state, env.reset())
+            else:
+                np.copyto(state, next_state)
+
+        stats[0] = steps
+        filled_queue.put((actor_id, index))
+
+        # 몇 블록마다 새 가중치가 있으면 가져옴
+        if steps % config['sync_interval'] < blocks.block_size:
+            new_version = weights.read_into(local, version)
+            if new_version is not None:
+                version = new_version
+
+    del stats, states, actions, rewards, next_states, dones, block
+    stats_shm.close()
+    blocks.close()
+    weights.close()
+
+
+# ====================================================================
+# learner (메인 프로세스)
+# ====================================================================
+def make_qnet():
+    """PyTorch QNet (convert_tfLite.ipynb와 같은 fc1/fc2/fc3 이름, 입력은 PongEnv 관측값 10개)"""
+    import torch.nn as nn
+    import torch.nn.functional as F
+
+    class QNet(nn.Module):
+        def __init__(self):
+            super(QNet, self).__init__()
+            self.fc1 = nn.Linear(LAYER_SIZES[0], LAYER_SIZES[1])
+            self.fc2 = nn.Linear(LAYER_SIZES[1], LAYER_SIZES[2])
+            self.fc3 = nn.Linear(LAYER_SIZES[2], LAYER_SIZES[3])
+
+        def forward(self, x):
+            x = F.relu(self.fc1(x))
+            x = F.relu(self.fc2(x))
+            return self.fc3(x)
+
+    return QNet()
+
+
+def check_actors(actors, errors):
+    """
+    학습 중에 종료된 actor가 있으면 RuntimeError (actor 에러 내용, 없으면 exitcode)
+    actor가 모두 죽으면 블록이 오지 않아 learner가 --duration까지 헛돌게 되므로 루프마다 확인
+    """
+    dead = [(actor_id, actor.exitcode) for actor_id, actor in enumerate(actors) if actor.exitcode is not None]
+    if not dead:
+        return
+    reasons = []
+    while True:
+        try:
+            actor_id, message = errors.get(timeout=0.1)
+        except queue.Empty:
+            break
+        reasons.append(f"actor {actor_id} 에러:\n{message}")
+    if not reasons:
+        reasons = [f"actor {actor_id}가 종료되었습니다 (exitcode {exitcode})" for actor_id, exitcode in dead]
+    raise RuntimeError("DQN 학습 중단 - " + "\n".join(reasons))
+
+
+def release_shared_memory(all_blocks, stats_shm, weights):
+    """learner가 만든 shared memory 닫기 + 해제 (뷰 배열을 먼저 지워야 함)"""
+    for blocks in all_blocks:
+        blocks.close()
+        blocks.shm.unlink()
+    stats_shm.close()
+    stats_shm.unlink()
+    weights.close()
+    weights.shm.unlink()
+
+
+def make_config(args, num_actors):
+    """actor/learner 공용 설정"""
+    return {
+        'num_actors': num_actors,
+        'num_slots': args.slots,
+        'block_size': args.block_size,
+        'sync_interval': args.sync_interval,
+        'epsilon_start': 1.0,
+        'epsilon_final': args.epsilon_final,
+        'epsilon_decay': args.epsilon_decay,
+        'seed': args.seed,
+    }
+
+
+def train(args, num_actors, output=None, verbose=True):
+    """
+    actor num_actors개로 args.duration초 동안 학습
+
+    Returns:
+        {'env_steps', 'updates', 'elapsed', 'steps_per_sec', 'updates_per_sec', 'episodes', 'avg_score'}
+    """
+    import torch
+    import torch.nn.functional as F
+
+    torch.manual_seed(args.seed)
+    torch.set_num_threads(args.learner_threads)
+    model = make_qnet()
+    target_model = make_qnet()
+    target_model.load_state_dict(model.state_dict())
+    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
+
+    if args.prioritized:
+        buffer = PrioritizedReplayBuffer(args.buffer_size, OBSERVATION_SIZE, args.batch_size, seed=args.seed)
+    else:
+        buffer = ReplayBuffer(args.buffer_size, OBSERVATION_SIZE, args.batch_size, seed=args.seed)
+
+    config = make_config(args, num_actors)
+    weights = SharedWeights()
+    weights.publish(model)
+    stats_shm = shared_memory.SharedMemory(create=True, size=num_actors * 3 * 8)
+    stats = np.ndarray((num_actors, 3), dtype=np.int64, buffer=stats_shm.buf)
+    stats[:] = 0
+    all_blocks = [TransitionBlocks(args.slots, args.block_size) for _ in range(num_actors)]
+
+    # spawn: fork와 달리 learner의 torch 스레드 상태를 물려받지 않음 (Windows에서도 동작)
+    context = mp.get_context('spawn')
+    filled_queue = context.Queue()
+    free_queues = [context.Queue() for _ in range(num_actors)]
+    errors = context.Queue()  # actor 에러 메시지 (에러 날 때만 사용)
+    stop_event = context.Event()
+    for free_queue in free_queues:
+        for index in range(args.slots):
+            free_queue.put(index)
+    actors = [
+        context.Process(target=actor_main, daemon=True,
+                        args=(actor_id, config, weights.name, all_blocks[actor_id].name, stats_shm.name,
+                              filled_queue, free_queues[actor_id], stop_event, errors))
+        for actor_id in range(num_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    updates = 0
+    block = None
+    start_time = time.perf_counter()
+    last_report = start_time
+    steps_at_start = None  # actor가 모두 뜬 뒤부터 측정
+    failed = True
+    try:
+        while time.perf_counter() - start_time < args.duration:
+            check_actors(actors, errors)
+
+            # 채워진 블록을 리플레이 버퍼로 옮기고 actor에게 돌려줌
+            # (학습할 수 없으면 블록이 올 때까지 기다림)
+            wait = len(buffer) < args.warmup
+            while True:
+                try:
+                    actor_id, index = filled_queue.get(timeout=0.1) if wait else filled_queue.get_nowait()
+                except queue.Empty:
+                    break
+                block = all_blocks[actor_id].slot(index)
+                buffer.add(block['states'], block['actions'], block['rewards'], block['next_states'], block['dones'])
+                free_queues[actor_id].put(index)
+                wait = False
+            if steps_at_start is None and len(buffer) >= args.warmup:
+                steps_at_start = int(stats[:, 0].sum())
+                measure_start = time.perf_counter()
+            if len(buffer) < args.warmup:
+                continue
+
+            # 배치 학습 (DQN, 타깃 네트워크, Huber 손실)
+            if args.prioritized:
+                states, actions, rewards, next_states, dones, is_weights, indices = buffer.sample()
+            else:
+                states, actions, rewards, next_states, dones = buffer.sample()
+            states_t = torch.from_numpy(states)
+            actions_t = torch.from_numpy(actions).long().unsqueeze(1)
+            rewards_t = torch.from_numpy(rewards)
+            next_states_t = torch.from_numpy(next_states)
+            dones_t = torch.from_numpy(dones).float()
+
+            q = model(states_t).gather(1, actions_t).squeeze(1)
+            with torch.no_grad():
+                next_q = target_model(next_states_t).max(1).values
+                target = rewards_t + args.gamma * (1.0 - dones_t) * next_q
+            losses = F.smooth_l1_loss(q, target, reduction='none')
+            if args.prioritized:
+                loss = (losses * torch.from_numpy(is_weights)).mean()
+            else:
+                loss = losses.mean()
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            updates += 1
+
+            if args.prioritized:
+                buffer.update_priorities(indices, (target - q).detach().numpy())
+            if updates % args.target_update == 0:
+                target_model.load_state_dict(model.state_dict())
+            if updates % args.publish_interval == 0:
+                weights.publish(model)
+
+            now = time.perf_counter()
+            if verbose and now - last_report >= args.report_interval:
+                last_report = now
+                env_steps, episodes, score_sum = stats.sum(axis=0)
+                print(f"   [{now - start_time:6.0f}s] env step {env_steps:>10,} | 학습 {updates:>8,}회 | "
+                      f"에피소드 {episodes:>6,} | 평균 점수 {score_sum / max(episodes, 1):6.2f}")
+        failed = False
+    finally:
+        stop_event.set()
+        for actor in actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+        if failed:  # 에러로 멈추면 shared memory만 해제하고 에러를 그대로 올림
+            del stats, block
+            release_shared_memory(all_blocks, stats_shm, weights)
+
+    elapsed = time.perf_counter() - (measure_start if steps_at_start is not None else start_time)
+    env_steps, episodes, score_sum = (int(value) for value in stats.sum(axis=0))
+    result = {
+        'actors': num_actors,
+        'env_steps': env_steps,
+        'updates': updates,
+        'elapsed': elapsed,
+        'steps_per_sec': (env_steps - (steps_at_start or 0)) / elapsed,
+        'updates_per_sec': updates / elapsed,
+        'episodes': episodes,
+        'avg_score': score_sum / max(episodes, 1),
+    }
+
+    if output:
+        torch.save(model.state_dict(), output)
+        if verbose:
+            print(f"\n 모델 저장: {output}")
+
+    del stats, block
+    release_shared_memory(all_blocks, stats_shm, weights)
+    return result
+
+
+def parse_args(argv=None):
+    """명령행 옵션"""
+    parser = argparse.ArgumentParser(description="PongEnv DQN 학습 (actor 여러 개 + learner)")
+    parser.add_argument('--actors', type=int, default=4, help="actor 프로세스 수 (기본값: 4)")
+    parser.add_argument('--duration', type=float, default=600, help="학습 시간 (초, 기본값: 600)")
+    parser.add_argument('--output', default='pong_model_dqn.pth',
+                        help="학습한 가중치 저장 경로 (.pth, 기본값: pong_model_dqn.pth)")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="--output 파일이 이미 있어도 덮어씀 (없으면 학습 전에 멈춤)")
+    parser.add_argument('--scaling', default=None,
+                        help="actor 수별로 --duration초씩 학습해서 steps/sec, updates/sec 비교 (예: 1,2,4,8)")
+    parser.add_argument('--prioritized', action='store_true', help="우선순위 리플레이 버퍼 사용")
+    parser.add_argument('--buffer-size', type=int, default=1_000_000, help="리플레이 버퍼 크기")
+    parser.add_argument('--batch-size', type=int, default=256, help="학습 배치 크기")
+    parser.add_argument('--warmup', type=int, default=10_000, help="학습을 시작할 최소 전이 수")
+    parser.add_argument('--lr', type=float, default=1e-3, help="학습률")
+    parser.add_argument('--gamma', type=float, default=0.99, help="할인율")
+    parser.add_argument('--target-update', type=int, default=1000, help="타깃 네트워크 갱신 간격 (학습 횟수)")
+    parser.add_argument('--publish-interval', type=int, default=50,
+                        help="actor에게 가중치를 보내는 간격 (학습 횟수)")
+    parser.add_argument('--sync-interval', type=int, default=1024,
+                        help="actor가 새 가중치를 확인하는 간격 (env step)")
+    parser.add_argument('--block-size', type=int, default=256, help="shared memory 블록 하나의 전이 수")
+    parser.add_argument('--slots', type=int, default=8, help="actor 하나의 블록 수")
+    parser.add_argument('--epsilon-final', type=float, default=0.05, help="최종 epsilon")
+    parser.add_argument('--epsilon-decay', type=int, default=200_000,
+                        help="epsilon이 최종 값까지 줄어드는 actor별 step 수")
+    parser.add_argument('--learner-threads', type=int, default=1, help="learner PyTorch 스레드 수")
+    parser.add_argument('--report-interval', type=float, default=10.0, help="진행 상황 출력 간격 (초)")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.scaling:
+        counts = [int(n) for n in args.scaling.split(',')]
+        print(f"\n actor 수별 처리량 (각 {args.duration:.0f}초, CPU {mp.cpu_count()}개)")
+        print(f"{'actor':>6}{'env step/s':>14}{'학습/s':>10}{'env step':>14}{'학습 횟수':>12}")
+        print("─" * 56)
+        for num_actors in counts:
+            result = train(args, num_actors, verbose=False)
+            print(f"{num_actors:>6}{result['steps_per_sec']:>14,.0f}{result['updates_per_sec']:>10,.1f}"
+                  f"{result['env_steps']:>14,}{result['updates']:>12,}")
+        return 0
+
+    if os.path.exists(args.output) and not args.overwrite:
+        print(f"\n {args.output}이(가) 이미 있습니다. 덮어쓰려면 --overwrite, 아니면 --output으로 다른 경로를 지정하세요.")
+        return 1
+
+    print(f"\n DQN 학습: actor {args.actors}개, {args.duration:.0f}초, "
+          f"{'우선순위' if args.prioritized else '균등'} 리플레이 {args.buffer_size:,}개")
+    result = train(args, args.actors, output=args.output)
+    print(f"\n env step: {result['env_steps']:,} ({result['steps_per_sec']:,.0f}/s)")
+    print(f" 학습: {result['updates']:,}회 ({result['updates_per_sec']:,.1f}/s)")
+    print(f" 에피소드: {result['episodes']:,} (평균 점수 {result['avg_score']:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고정 간격 시뮬레이션 + 렌더링 속도 분리 (accumulator 방식)
+렌더링은 render_fps로 돌고, 프레임마다 실제로 흐른 시간만큼 sim_fps 간격의 step을 몰아서 실행
+남은 시간 비율(alpha)로 직전 step과 현재 step 사이 위치를 보간해서 그림
+"""
+
+from time import perf_counter
+
+
+class FixedTimestep:
+    """실제 흐른 시간 → 이번 프레임에 실행할 시뮬레이션 step 수"""
+
+    def __init__(self, sim_fps=120, max_steps=16):
+        """
+        Args:
+            sim_fps: 초당 시뮬레이션 step 수 (PongEnv.target_fps)
+            max_steps: 한 프레임에 실행할 최대 step 수
+                       (느린 기기에서 밀린 시간이 계속 쌓이는 것을 막음, 넘는 시간은 버림)
+        """
+        self.dt = 1.0 / sim_fps
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # max_steps를 넘어서 버린 시간 (초)
+        self._last_time = None
+
+    def reset(self):
+        """에피소드 시작 등 시간이 끊기는 곳에서 호출 (쌓인 시간 초기화)"""
+        self.accumulator = 0.0
+        self._last_time = None
+
+    def advance(self):
+        """지난 호출 이후 흐른 시간만큼 실행할 step 수 (첫 호출은 1)"""
+        now = perf_counter()
+        if self._last_time is None:
+            self._last_time = now
+            return 1
+        self.accumulator += now - self._last_time
+        self._last_time = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """직전 step 이후 다음 step까지 진행한 비율 (0~1, 보간용)"""
+        return min(self.accumulator / self.dt, 1.0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+게임 루프 프레임 구간별 시간 기록 (run_game.py --trace-frames)
+프레임마다 이벤트 처리 / 추론 / env.step / 그리기 / display.flip / clock.tick 구간 시간을
+time.perf_counter_ns()로 재서 미리 만들어 둔 링 버퍼에 기록하고, 끝나면 CSV/바이너리로 저장 + 백분위 표 출력
+한 프레임에 step을 여러 번 하면(FixedTimestep) 추론/step 시간은 그 프레임 안에서 합산
+"""
+
+from array import array
+from time import perf_counter_ns
+
+import numpy as np
+
+
+class FrameTrace:
+    """프레임 구간별 시간 링 버퍼"""
+
+    # 구간 번호 (mark에 전달, 0번 열은 프레임 시작 시각, 나머지 열은 구간별 누적 시간)
+    EVENTS = 1
+    INFERENCE = 2
+    STEP = 3
+    DRAW = 4
+    FLIP = 5
+    TICK = 6
+    PHASES = ('events', 'inference', 'step', 'draw', 'flip', 'tick')
+
+    def __init__(self, capacity=65536):
+        """
+        Args:
+            capacity: 기록할 최근 프레임 수 (넘으면 오래된 프레임부터 덮어씀)
+        """
+        self.capacity = capacity
+        self.width = len(self.PHASES) + 1
+        self.frames = 0
+        # int64 [capacity, width] (array 원소 대입이 NumPy보다 가벼움)
+        self._buffer = array('q', bytes(8 * capacity * self.width))
+        self._zeros = array('q', bytes(8 * len(self.PHASES)))  # 재사용하는 행을 비울 때 사용
+        self._row = 0
+        self._last = 0  # 마지막으로 기록한 시각
+
+    def start_frame(self):
+        """새 프레임 시작 시각 기록"""
+        row = self._row = (self.frames % self.capacity) * self.width
+        self._buffer[row + 1:row + self.width] = self._zeros
+        self._buffer[row] = self._last = perf_counter_ns()
+        self.frames += 1
+
+    def mark(self, phase):
+        """
+        직전 기록 이후 지금까지의 시간을 phase 구간에 더함 (FrameTrace.EVENTS 등)
+        같은 프레임에서 같은 구간을 여러 번 기록하면 (step 여러 번) 합산됨
+        """
+        now = perf_counter_ns()
+        self._buffer[self._row + phase] += now - self._last
+        self._last = now
+
+    def records(self):
+        """기록된 프레임 [프레임, 1 + 구간 수] (시작 시각 + 구간별 시간 ns, 오래된 프레임부터)"""
+        stored = min(self.frames, self.capacity)
+        records = np.frombuffer(self._buffer, dtype=np.int64).reshape(self.capacity, self.width)[:stored]
+        if self.frames > self.capacity:
+            start = self.frames % self.capacity
+            records = np.concatenate([records[start:], records[:start]])
+        return records.copy()
+
+    def durations(self):
+        """
+        구간별 시간 [프레임, 구간 수] (ns)
+        그 프레임에서 기록되지 않은 구간(예: 렌더링 없음)은 0
+        """
+        return self.records()[:, 1:]
+
+    def dump(self, path):
+        """
+        기록 저장
+        .csv: 프레임별 구간 시간(us) 표, 그 외: 시작 시각 + 구간별 시간(ns) int64 배열(.npy)
+        """
+        if path.endswith('.csv'):
+            durations = self.durations() / 1000.0
+            header = 'frame,' + ','.join(f'{phase}_us' for phase in self.PHASES) + ',total_us'
+            rows = np.column_stack([np.arange(len(durations)), durations, durations.sum(axis=1)])
+            np.savetxt(path, rows, delimiter=',', header=header, comments='',
+                       fmt=['%d'] + ['%.1f'] * (len(self.PHASES) + 1))
+        else:
+            np.save(path, self.records())
+
+    def print_summary(self):
+        """구간별 p50/p90/p99/최대(ms)와 전체 시간 중 비율 출력"""
+        durations = self.durations() / 1e6  # ms
+        if len(durations) == 0:
+            return
+        totals = durations.sum(axis=1)
+        print(f"\n{'─'*60}")
+        print(f" 프레임 구간별 시간 (최근 {len(durations)}프레임, ms)")
+        print(f"{'─'*60}")
+        print(f"   {'구간':<10}{'p50':>9}{'p90':>9}{'p99':>9}{'최대':>9}{'비율':>8}")
+        columns = [(phase, durations[:, i]) for i, phase in enumerate(self.PHASES)] + [('total', totals)]
+        for phase, values in columns:
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            share = values.sum() / totals.sum() * 100 if totals.sum() > 0 else 0.0
+            print(f"   {phase:<10}{p50:>9.3f}{p90:>9.3f}{p99:>9.3f}{values.max():>9.3f}{share:>7.1f}%")
+        print(f"{'─'*60}")
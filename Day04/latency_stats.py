@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+메모리가 늘어나지 않는 지연 시간 통계
+로그 간격 히스토그램(HDR 히스토그램 방식)으로 전체 p50/p90/p99를,
+최근 값 링 버퍼로 "최근 N초" 통계를 계산 (기록은 O(1), 메모리는 고정)
+"""
+
+import math
+import time
+
+import numpy as np
+
+
+class LatencyStats:
+    """지연 시간(ms) 스트리밍 통계"""
+
+    def __init__(self, sub_buckets=32, max_exponent=36, window_size=4096):
+        """
+        Args:
+            sub_buckets: 2배 구간 하나를 나누는 칸 수 (32면 상대 오차 약 3%)
+            max_exponent: 기록할 수 있는 최대 값 = 2^max_exponent us (36이면 약 19시간)
+            window_size: 최근 값 링 버퍼 크기
+        """
+        self.sub_buckets = sub_buckets
+        # 0번 칸은 1us 미만, 그 다음부터 [2^e, 2^(e+1)) us 구간마다 sub_buckets칸
+        self.counts = np.zeros(1 + max_exponent * sub_buckets, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+        # 최근 값 링 버퍼 (기록 시각, 값)
+        self.window_size = window_size
+        self._times = np.zeros(window_size)
+        self._values = np.zeros(window_size)
+        self._next = 0
+
+    def record(self, value, now=None):
+        """
+        값 하나 기록 (O(1))
+
+        Args:
+            value: 지연 시간 (ms)
+            now: 기록 시각 (time.perf_counter() 기준 초, 없으면 현재 시각)
+        """
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.counts[self._bucket(value)] += 1
+
+        i = self._next % self.window_size
+        self._times[i] = time.perf_counter() if now is None else now
+        self._values[i] = value
+        self._next += 1
+
+    def _bucket(self, value):
+        """값(ms)이 들어갈 히스토그램 칸 번호"""
+        us = value * 1000.0
+        if us < 1.0:
+            return 0
+        mantissa, exponent = math.frexp(us)  # us = mantissa * 2^exponent, mantissa는 [0.5, 1)
+        index = 1 + (exponent - 1) * self.sub_buckets + int((mantissa * 2.0 - 1.0) * self.sub_buckets)
+        return min(index, len(self.counts) - 1)
+
+    def _bucket_upper(self, index):
+        """칸 번호의 위쪽 경계 값 (ms)"""
+        if index == 0:
+            return 0.001
+        exponent, sub = divmod(index - 1, self.sub_buckets)
+        return 2.0 ** exponent * (1.0 + (sub + 1) / self.sub_buckets) / 1000.0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """
+        전체 기록의 p 백분위 값 (ms)
+        해당 칸의 위쪽 경계를 반환 (실제 최댓값을 넘지 않음)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(self._bucket_upper(index), self.max)
+
+    def window(self, seconds, now=None):
+        """
+        최근 seconds초 동안 기록된 값 배열 (링 버퍼에 남아 있는 것만)
+
+        Args:
+            seconds: 최근 몇 초
+            now: 기준 시각 (time.perf_counter() 기준 초, 없으면 현재 시각)
+        """
+        stored = min(self._next, self.window_size)
+        now = time.perf_counter() if now is None else now
+        recent = self._times[:stored] >= now - seconds
+        return self._values[:stored][recent]
+
+    def window_summary(self, seconds, now=None):
+        """최근 seconds초의 {count, mean, p50, p90, p99, max} (기록이 없으면 None)"""
+        values = self.window(seconds, now)
+        if values.size == 0:
+            return None
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        return {
+            'count': int(values.size),
+            'mean': float(values.mean()),
+            'p50': float(p50),
+            'p90': float(p90),
+            'p99': float(p99),
+            'max': float(values.max()),
+        }
+
+    def summary(self):
+        """전체 기록의 {count, mean, min, p50, p90, p99, max}"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
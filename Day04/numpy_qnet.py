@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumPy만으로 QNet(완전연결 MLP)을 실행하는 추론 백엔드
+TensorFlow/tflite_runtime 없이 pong_model.pth, .npz, .tflite에서
+가중치를 읽어 미리 만들어 둔 버퍼에 행렬 곱(np.dot, out=)으로 계산
+"""
+
+import struct
+
+import numpy as np
+
+
+class NumpyQNet:
+    """Dense(+ReLU) 레이어를 차례로 계산하는 NumPy 추론기"""
+
+    def __init__(self, layers):
+        """
+        Args:
+            layers: [(W, b, relu), ...] 리스트
+                    W: [입력, 출력] float32, b: [출력] float32, relu: ReLU 적용 여부
+        """
+        self.layers = [
+            (np.ascontiguousarray(W, dtype=np.float32), np.asarray(b, dtype=np.float32), relu)
+            for W, b, relu in layers
+        ]
+        self.input_size = self.layers[0][0].shape[0]
+        self.output_size = self.layers[-1][0].shape[1]
+
+        self._zero = np.float32(0.0)
+
+        # 레이어별 출력 버퍼 (배치 크기가 바뀔 때만 새로 만듦)
+        self.batch_size = 0
+        self._buffers = []
+        self._allocate(1)
+
+    def _allocate(self, batch_size):
+        """배치 크기에 맞는 레이어 출력 버퍼 준비"""
+        if batch_size == self.batch_size:
+            return
+        self._buffers = [np.empty((batch_size, W.shape[1]), dtype=np.float32) for W, b, relu in self.layers]
+        self.batch_size = batch_size
+
+    def forward(self, x):
+        """
+        Q값 계산
+
+        Args:
+            x: [B, 입력] float32 배열
+
+        Returns:
+            [B, 출력] Q값 (내부 버퍼이므로 다음 forward에서 덮어쓰임)
+        """
+        self._allocate(x.shape[0])
+        h = x
+        for (W, b, relu), out in zip(self.layers, self._buffers):
+            # 2차원 행렬 곱은 np.dot이 np.matmul보다 호출 오버헤드가 작음
+            np.dot(h, W, out=out)
+            np.add(out, b, out=out)
+            if relu:
+                np.maximum(out, self._zero, out=out)
+            h = out
+        return h
+
+    # ------------------------------------------------------------------
+    # 가중치 불러오기 / 저장
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, model_path):
+        """파일 확장자(.tflite / .npz / .pth)에 맞게 가중치를 읽어서 생성"""
+        if model_path.endswith('.tflite'):
+            return cls.from_tflite(model_path)
+        if model_path.endswith('.npz'):
+            return cls.from_npz(model_path)
+        if model_path.endswith('.pth') or model_path.endswith('.pt'):
+            return cls.from_pth(model_path)
+        raise ValueError(f"지원하지 않는 모델 파일입니다: {model_path}")
+
+    @classmethod
+    def from_state_dict(cls, weights):
+        """
+        PyTorch QNet 이름 규칙(fc1.weight, fc1.bias, ...)의 가중치로 생성
+        마지막 레이어를 제외한 모든 레이어에 ReLU 적용 (QNet.forward와 동일)
+        """
+        names = sorted({key.rsplit('.', 1)[0] for key in weights if key.endswith('.weight')},
+                       key=lambda name: int(name.lstrip('fc')))
+        layers = []
+        for i, name in enumerate(names):
+            # PyTorch Linear 가중치는 [출력, 입력]이라 전치
+            W = np.asarray(weights[f'{name}.weight'], dtype=np.float32).T
+            b = np.asarray(weights[f'{name}.bias'], dtype=np.float32)
+            layers.append((W, b, i < len(names) - 1))
+        return cls(layers)
+
+    @classmethod
+    def from_npz(cls, path):
+        """np.savez('pong_model.npz', **weights)로 저장한 가중치에서 생성"""
+        with np.load(path) as data:
+            return cls.from_state_dict({key: data[key] for key in data.files})
+
+    @classmethod
+    def from_pth(cls, path):
+        """pong_model.pth (PyTorch state_dict)에서 생성 (torch 필요)"""
+        import torch
+        state_dict = torch.load(path, map_location='cpu')
+        return cls.from_state_dict({key: value.numpy() for key, value in state_dict.items()})
+
+    @classmethod
+    def from_tflite(cls, path):
+        """pong_model.tflite의 FULLY_CONNECTED 레이어 가중치를 직접 읽어서 생성"""
+        with open(path, 'rb') as f:
+            return cls(_read_tflite_dense_layers(f.read()))
+
+    def save_npz(self, path):
+        """가중치를 .npz로 저장 (PyTorch QNet과 같은 fc1.weight, fc1.bias ... 이름)"""
+        weights = {}
+        for i, (W, b, relu) in enumerate(self.layers, start=1):
+            weights[f'fc{i}.weight'] = W.T
+            weights[f'fc{i}.bias'] = b
+        np.savez(path, **weights)
+
+
+# ======================================================================
+# TFLite(flatbuffer) 파일에서 Dense 가중치 읽기
+# 필요한 필드만 읽는 최소 구현 (스키마: tensorflow/lite/schema/schema.fbs)
+# ======================================================================
+_TFLITE_FULLY_CONNECTED = 9
+_TFLITE_TYPES = {0: np.float32, 1: np.float16, 9: np.int8}
+_TFLITE_RELU = 1
+
+
+class _FlatTable:
+    """flatbuffer 테이블 하나 (필드 번호로 값 읽기)"""
+
+    def __init__(self, data, pos):
+        self.data = data
+        self.pos = pos
+        vtable = pos - struct.unpack_from('<i', data, pos)[0]
+        self.vtable = vtable
+        self.vtable_size = struct.unpack_from('<H', data, vtable)[0]
+
+    def _field(self, index):
+        """필드 위치 (없으면 None)"""
+        entry = 4 + 2 * index
+        if entry >= self.vtable_size:
+            return None
+        offset = struct.unpack_from('<H', self.data, self.vtable + entry)[0]
+        return self.pos + offset if offset else None
+
+    def scalar(self, index, fmt, default=0):
+        pos = self._field(index)
+        return default if pos is None else struct.unpack_from('<' + fmt, self.data, pos)[0]
+
+    def _target(self, index):
+        pos = self._field(index)
+        return None if pos is None else pos + struct.unpack_from('<I', self.data, pos)[0]
+
+    def table(self, index):
+        pos = self._target(index)
+        return None if pos is None else _FlatTable(self.data, pos)
+
+    def vector(self, index, dtype):
+        """스칼라 벡터를 NumPy 배열로 (없으면 빈 배열)"""
+        pos = self._target(index)
+        if pos is None:
+            return np.zeros(0, dtype=dtype)
+        length = struct.unpack_from('<I', self.data, pos)[0]
+        return np.frombuffer(self.data, dtype=dtype, count=length, offset=pos + 4)
+
+    def tables(self, index):
+        """테이블 벡터를 _FlatTable 리스트로"""
+        pos = self._target(index)
+        if pos is None:
+            return []
+        length = struct.unpack_from('<I', self.data, pos)[0]
+        items = []
+        for i in range(length):
+            item = pos + 4 + 4 * i
+            items.append(_FlatTable(self.data, item + struct.unpack_from('<I', self.data, item)[0]))
+        return items
+
+
+def _read_tflite_tensor(data, tensor, buffers):
+    """상수 텐서 값을 float32 배열로 (int8 가중치는 scale을 곱해 역양자화)"""
+    tensor_type = tensor.scalar(1, 'b')
+    if tensor_type not in _TFLITE_TYPES:
+        raise ValueError(f"지원하지 않는 TFLite 텐서 타입입니다: {tensor_type}")
+    shape = tuple(tensor.vector(0, np.int32))
+    buffer = buffers[tensor.scalar(2, 'I')]
+    raw = buffer.vector(0, np.uint8)
+    if raw.size == 0:
+        # 큰 모델은 데이터를 flatbuffer 뒤에 따로 저장 (offset/size 필드)
+        offset, size = buffer.scalar(1, 'Q'), buffer.scalar(2, 'Q')
+        raw = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset)
+    values = raw.view(_TFLITE_TYPES[tensor_type]).reshape(shape).astype(np.float32)
+
+    quantization = tensor.table(4)
+    if tensor_type == 9 and quantization is not None:
+        scale = quantization.vector(2, np.float32)
+        zero_point = quantization.vector(3, np.int64)
+        axis = quantization.scalar(6, 'i')
+        # 채널별(per-channel) 또는 텐서 전체(per-tensor) 역양자화
+        bshape = [1] * values.ndim
+        bshape[axis] = -1
+        if scale.size > 1:
+            scale = scale.reshape(bshape)
+            zero_point = zero_point.reshape(bshape) if zero_point.size > 1 else zero_point
+        values = (values - zero_point) * scale
+    return values.astype(np.float32)
+
+
+def _read_tflite_dense_layers(data):
+    """TFLite 모델의 FULLY_CONNECTED 연산들을 [(W, b, relu), ...]로 변환"""
+    model = _FlatTable(data, struct.unpack_from('<I', data, 0)[0])
+    opcodes = model.tables(1)
+    subgraph = model.tables(2)[0]
+    buffers = model.tables(4)
+    tensors = subgraph.tables(0)
+
+    layers = []
+    for op in subgraph.tables(3):
+        opcode = opcodes[op.scalar(0, 'I')]
+        # 새 모델은 builtin_code(int32), 옛 모델은 deprecated_builtin_code(int8)에 기록
+        builtin = max(opcode.scalar(0, 'b'), opcode.scalar(3, 'i'))
+        if builtin != _TFLITE_FULLY_CONNECTED:
+            raise ValueError(f"Dense 레이어가 아닌 연산이 있습니다 (builtin code {builtin})")
+
+        inputs = op.vector(1, np.int32)
+        W = _read_tflite_tensor(data, tensors[inputs[1]], buffers)  # [출력, 입력]
+        if len(inputs) > 2 and inputs[2] >= 0:
+            b = _read_tflite_tensor(data, tensors[inputs[2]], buffers)
+        else:
+            b = np.zeros(W.shape[0], dtype=np.float32)
+        options = op.table(4)
+        relu = options is not None and options.scalar(0, 'b') == _TFLITE_RELU
+        layers.append((W.T, b, relu))
+    return layers
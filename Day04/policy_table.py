@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+QNet 정책을 양자화된 관측값 격자의 행동 표(uint8)로 미리 계산하는 도구
+관측값을 격자 칸 번호 하나로 바꾸면 추론 없이 표에서 바로 행동을 꺼낼 수 있음
+
+격자 구성 (관측값 [공x, 공y, 공2x, 공2y, 패들x, 공dx, 공dy, 공2dx, 공2dy, 공2활성]):
+    위치 5개: 0~1 구간을 position_bins칸으로 나눔
+              공 y는 놓친 공(y > 1, 계속 아래로 내려감)도 구분하도록 0~y_max 구간을
+              같은 간격으로 나눔 (y_max보다 아래는 마지막 칸)
+    속도 4개: 부호(+/-)만 사용, 크기는 속도 단계(speed_bins칸) 하나로 공유
+              (PongEnv에서 모든 공의 속도 크기는 점수로 정해진 값 하나)
+    두 번째 공 활성 여부: 2칸
+"""
+
+import time
+
+import numpy as np
+
+
+class PolicyTable:
+    """양자화된 관측값 → 행동(uint8) 표"""
+
+    def __init__(self, table, position_bins, speed_bins, speed_min, speed_max, y_max=2.0):
+        """
+        Args:
+            table: 칸마다 행동이 들어 있는 1차원 uint8 배열
+            position_bins: 위치 한 축을 나누는 칸 수
+            speed_bins: 속도 크기 단계 수
+            speed_min, speed_max: 속도 크기 범위 (PongEnv.ball_speed_min/max)
+            y_max: 공 y축 격자 범위 (0~y_max, 1보다 크면 놓친 공)
+        """
+        self.position_bins = position_bins
+        self.speed_bins = speed_bins
+        self.speed_min = speed_min
+        self.speed_max = speed_max
+        self.y_max = y_max
+
+        # 칸 번호 = 위치 5개, 속도 부호 4개, 속도 단계, 활성 여부를 섞은 자릿수(mixed radix)
+        self.shape = self.grid_shape(position_bins, speed_bins, y_max)
+        self.size = int(np.prod(self.shape))
+        self.position_max = np.array(self.shape[:5]) - 1  # 위치 축별 마지막 칸 번호
+        strides = np.cumprod((1,) + self.shape[:0:-1])[::-1]
+        self.position_strides = strides[:5]
+        self.sign_strides = strides[5:9]
+        self.speed_stride = strides[9]
+
+        self.table = np.asarray(table, dtype=np.uint8)
+        if self.table.size != self.size:
+            raise ValueError(f"표 크기({self.table.size})가 격자 크기({self.size})와 다릅니다.")
+
+        # get_action(관측값 하나)용 파이썬 숫자 사본
+        self._position_strides = self.position_strides.tolist()
+        self._position_last = self.position_max.tolist()
+        self._sign_strides = self.sign_strides.tolist()
+        self._speed_stride = int(self.speed_stride)
+        self._speed_scale = self.speed_bins / (speed_max - speed_min)
+        self._actions = memoryview(self.table)  # 인덱싱하면 바로 파이썬 int
+
+    @staticmethod
+    def grid_shape(position_bins, speed_bins, y_max):
+        """격자 모양 (공x, 공y, 공2x, 공2y, 패들x, 속도 부호 4개, 속도 단계, 활성 여부)"""
+        x_bins, y_bins = position_bins, int(round(position_bins * y_max))  # y칸 간격도 1/position_bins
+        return (x_bins, y_bins, x_bins, y_bins, x_bins) + (2,) * 4 + (speed_bins, 2)
+
+    @property
+    def nbytes(self):
+        """표 메모리 크기 (bytes)"""
+        return self.table.nbytes
+
+    def index(self, states):
+        """
+        관측값을 격자 칸 번호로 변환
+
+        Args:
+            states: [10] 또는 [B, 10] 관측값
+
+        Returns:
+            칸 번호 (정수 또는 [B] 배열)
+        """
+        states = np.asarray(states)
+        bins = self.position_bins
+        positions = np.clip((states[..., :5] * bins).astype(np.int64), 0, self.position_max)
+        signs = states[..., 5:9] > 0
+        speed = (np.abs(states[..., 5]) - self.speed_min) * (self.speed_bins / (self.speed_max - self.speed_min))
+        speed = np.clip(speed.astype(np.int64), 0, self.speed_bins - 1)
+        active = states[..., 9] > 0.5
+        return (positions @ self.position_strides + signs @ self.sign_strides
+                + speed * self.speed_stride + active)
+
+    def get_action(self, state):
+        """
+        관측값 하나의 행동 (칸 번호 계산 + 표 조회)
+
+        작은 배열에 NumPy 연산을 여러 번 하면 호출 오버헤드가 더 커서
+        관측값 하나는 파이썬 숫자로 바꿔서 직접 계산
+        """
+        bx, by, b2x, b2y, px, dx, dy, b2dx, b2dy, active = state.tolist()
+        bins = self.position_bins
+        index = 0
+        for value, stride, last in zip((bx, by, b2x, b2y, px), self._position_strides, self._position_last):
+            cell = int(value * bins)
+            index += (0 if cell < 0 else last if cell > last else cell) * stride
+        for value, stride in zip((dx, dy, b2dx, b2dy), self._sign_strides):
+            if value > 0:
+                index += stride
+        speed = int((abs(dx) - self.speed_min) * self._speed_scale)
+        index += (0 if speed < 0 else min(speed, self.speed_bins - 1)) * self._speed_stride
+        if active > 0.5:
+            index += 1
+        return self._actions[index]
+
+    def get_actions(self, states):
+        """[B, 10] 관측값의 행동 배열"""
+        return self.table[self.index(states)]
+
+    def grid_states(self, start, stop):
+        """
+        칸 번호 start~stop-1의 대표 관측값 [stop-start, 10]
+
+        위치는 칸의 가운데 값, 속도 크기는 단계의 시작 값 (속도는 대부분 최소 속도 근처)
+        """
+        digits = np.unravel_index(np.arange(start, stop), self.shape)
+        states = np.empty((stop - start, 10), dtype=np.float32)
+        for i in range(5):
+            states[:, i] = (digits[i] + 0.5) / self.position_bins
+        speed = self.speed_min + digits[9] * (self.speed_max - self.speed_min) / self.speed_bins
+        for i in range(4):
+            states[:, 5 + i] = np.where(digits[5 + i] == 1, speed, -speed)
+        states[:, 9] = digits[10]
+        return states
+
+    @classmethod
+    def build(cls, predict_actions, position_bins, speed_bins=1,
+              speed_min=0.025, speed_max=0.3, y_max=2.0, batch_size=65536):
+        """
+        격자의 모든 칸을 네트워크로 평가해서 표 생성
+
+        Args:
+            predict_actions: [B, 10] 관측값 → [B] 행동 배열 함수 (예: PongAgent.get_actions의 행동)
+            position_bins, speed_bins, speed_min, speed_max, y_max: 격자 설정
+            batch_size: 한 번에 평가할 칸 수
+        """
+        table = np.empty(int(np.prod(cls.grid_shape(position_bins, speed_bins, y_max))), dtype=np.uint8)
+        policy = cls(table, position_bins, speed_bins, speed_min, speed_max, y_max)
+        for start in range(0, policy.size, batch_size):
+            stop = min(start + batch_size, policy.size)
+            table[start:stop] = predict_actions(policy.grid_states(start, stop))
+        return policy
+
+    @classmethod
+    def load(cls, path):
+        """save()로 저장한 .npz 표 불러오기"""
+        with np.load(path) as data:
+            return cls(data['table'], int(data['position_bins']), int(data['speed_bins']),
+                       float(data['speed_min']), float(data['speed_max']), float(data['y_max']))
+
+    def save(self, path):
+        """표와 격자 설정을 .npz로 저장"""
+        np.savez_compressed(path, table=self.table, position_bins=self.position_bins,
+                            speed_bins=self.speed_bins, speed_min=self.speed_min,
+                            speed_max=self.speed_max, y_max=self.y_max)
+
+
+def sample_game_states(num_envs=4096, num_snapshots=50, interval=20, seed=0):
+    """실제 게임 진행 중의 관측값 수집 (랜덤 행동, interval 스텝마다 저장)"""
+    from pong_vec_env import PongVecEnv
+
+    env = PongVecEnv(num_envs)
+    state = env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    snapshots = []
+    for _ in range(num_snapshots):
+        for _ in range(interval):
+            state, reward, done, info = env.step(rng.integers(0, env.action_space_n, size=num_envs))
+        snapshots.append(state)
+    return np.concatenate(snapshots)
+
+
+def play_scores(get_action, seeds, max_frames=20000):
+    """시드별로 한 에피소드씩 get_action(관측값 → 행동)으로 진행한 점수 리스트"""
+    from wlqrkrhtlvek1 import FastPongEnv
+
+    env = FastPongEnv()
+    scores = []
+    for seed in seeds:
+        state = env.reset(seed=seed)
+        score = 0
+        for _ in range(max_frames):
+            state, reward, done, info = env.step(get_action(state))
+            score = info['score']
+            if done:
+                break
+        scores.append(score)
+    return scores
+
+
+# ====================================================================
+# 격자 해상도별 표 만들기 + 실제 네트워크와의 불일치율/메모리 보고
+# ====================================================================
+if __name__ == "__main__":
+    import argparse
+
+    from run_game import PongAgent
+    from wlqrkrhtlvek1 import PongEnv
+
+    parser = argparse.ArgumentParser(description="QNet 정책 → 행동 표 변환 + 불일치율/점수 보고")
+    parser.add_argument('--output', default=None, metavar='PATH',
+                        help="--save-bins 해상도의 표를 저장할 .npz 경로 "
+                             "(run_game.py --backend table --table PATH용, 없으면 보고만 하고 저장 안 함)")
+    parser.add_argument('--save-bins', type=int, default=12,
+                        help="--output으로 저장할 표의 위치 칸 수 (기본값: 12)")
+    args = parser.parse_args()
+
+    MODEL_PATH = 'pong_model.tflite'
+    POSITION_BINS = sorted(set([4, 6, 8, 10, 12, args.save_bins]))
+    SEEDS = range(20)
+
+    env = PongEnv()
+    agent = PongAgent(model_path=MODEL_PATH, frame_skip=1)
+
+    def predict_actions(states):
+        return agent.get_actions(states)[0]
+
+    states = sample_game_states()
+    reference, q_values = agent.get_actions(states)
+    in_play = (states[:, 1] <= 1.0) & (states[:, 3] <= 1.0)  # 놓친 공이 없는 관측값
+    print(f"\n비교용 게임 관측값: {len(states):,}개 (놓친 공 없음: {in_play.mean() * 100:.1f}%)")
+
+    network_scores = play_scores(agent.get_action, SEEDS)
+    print(f"네트워크 평균 점수: {np.mean(network_scores):.2f} (시드 {len(SEEDS)}개)")
+
+    # 불일치율: 네트워크와 다른 행동을 고른 비율, Q 손실: 표 행동의 Q값이 최대 Q값보다 작은 정도(평균)
+    print(f"\n{'위치 칸 수':>10}{'표 크기(칸)':>14}{'메모리':>11}{'생성 시간':>10}"
+          f"{'불일치율':>10}{'(경기 중)':>10}{'Q 손실':>10}{'평균 점수':>10}")
+    print("─" * 85)
+    for bins in POSITION_BINS:
+        start_time = time.perf_counter()
+        policy = PolicyTable.build(predict_actions, bins,
+                                   speed_min=env.ball_speed_min, speed_max=env.ball_speed_max)
+        build_time = time.perf_counter() - start_time
+        actions = policy.get_actions(states)
+        mismatch = actions != reference
+        q_loss = np.mean(q_values.max(axis=1) - q_values[np.arange(len(states)), actions])
+        score = np.mean(play_scores(policy.get_action, SEEDS))
+        print(f"{bins:>10}{policy.size:>14,}{policy.nbytes / 2**20:>9.2f}MB{build_time:>9.1f}s"
+              f"{mismatch.mean() * 100:>9.2f}%{mismatch[in_play].mean() * 100:>9.2f}%{q_loss:>10.4f}{score:>10.2f}")
+        if args.output is not None and bins == args.save_bins:
+            policy.save(args.output)
+
+    if args.output is not None:
+        print(f"\n{args.save_bins}칸 표 저장: {args.output}")
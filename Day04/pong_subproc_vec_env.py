@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 프로세스에 나눠서 진행하는 Pong 벡터 환경 (멀티코어 데이터 수집용)
+PongEnv는 순수 파이썬이라 스레드로는 GIL 때문에 코어 하나만 쓰므로
+worker 프로세스마다 게임 일부를 맡기고, 행동/관측값/보상/종료 여부는
+shared memory 배열로 주고받음 (pickle 없음, 동기화는 Barrier 두 개)
+
+사용법은 PongVecEnv와 같고, step_async/step_wait로 나눠 부르면
+worker들이 게임을 진행하는 동안 메인 프로세스에서 다른 일(추론 등)을 할 수 있음
+"""
+
+import multiprocessing as mp
+import queue
+import traceback
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from wlqrkrhtlvek1 import FastPongEnv
+
+# worker 명령 (shared memory의 command 칸)
+_STEP = 0
+_RESET = 1
+_CLOSE = 2
+
+OBSERVATION_SIZE = 10
+
+
+def _shared_arrays(buffer, num_envs):
+    """shared memory 하나를 필드별 배열로 나눔 (메인/worker가 같은 배치를 사용)"""
+    layout = [
+        ('command', (1,), np.int64),
+        ('seed', (1,), np.int64),  # reset 시드 (-1이면 None)
+        ('actions', (num_envs,), np.int64),
+        ('observations', (num_envs, OBSERVATION_SIZE), np.float32),
+        ('final_observations', (num_envs, OBSERVATION_SIZE), np.float32),
+        ('rewards', (num_envs,), np.float32),
+        ('dones', (num_envs,), np.bool_),
+        ('scores', (num_envs,), np.int64),
+    ]
+    arrays = {}
+    offset = 0
+    for name, shape, dtype in layout:
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if buffer is not None:
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += nbytes + (-nbytes % 8)  # 8바이트 경계 맞춤
+    return arrays, offset
+
+
+def _worker_main(worker_id, start, stop, env_cls, shm_name, num_envs, start_barrier, done_barrier, errors):
+    """
+    worker 프로세스 진입점
+    에러가 나면 내용을 errors 큐로 보내고 barrier를 깨서 메인이 기다리다 멈추지 않게 함
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _worker_loop(start, stop, env_cls, shm.buf, num_envs, start_barrier, done_barrier)
+    except BrokenBarrierError:
+        pass  # 메인이나 다른 worker 쪽에서 먼저 깨뜨림
+    except Exception:
+        errors.put((worker_id, traceback.format_exc()))
+        start_barrier.abort()
+        done_barrier.abort()
+    finally:
+        shm.close()
+
+
+def _worker_loop(start, stop, env_cls, buffer, num_envs, start_barrier, done_barrier):
+    """
+    게임 start~stop-1을 맡아서 명령이 올 때마다 진행
+
+    start_barrier: 메인이 행동/명령을 다 쓰면 통과, done_barrier: 모든 worker가 결과를 다 쓰면 통과
+    """
+    arrays, _ = _shared_arrays(buffer, num_envs)
+    command, seed, actions = arrays['command'], arrays['seed'], arrays['actions']
+    observations, final_observations = arrays['observations'], arrays['final_observations']
+    rewards, dones, scores = arrays['rewards'], arrays['dones'], arrays['scores']
+    envs = [(i, env_cls()) for i in range(start, stop)]
+
+    while True:
+        start_barrier.wait()
+        cmd = int(command[0])
+        if cmd == _CLOSE:
+            break
+        if cmd == _RESET:
+            base_seed = int(seed[0])
+            for i, env in envs:
+                observations[i] = env.reset(seed=None if base_seed < 0 else base_seed + i)
+        else:
+            for i, env in envs:
+                # 관측값은 shared memory의 자기 행에 바로 씀
+                state, reward, done, info = env.step(int(actions[i]), out=observations[i])
+                rewards[i] = reward
+                dones[i] = done
+                scores[i] = info['score']
+                if done:
+                    # 끝난 게임은 그 자리에서 리셋 (PongVecEnv와 같은 규칙)
+                    final_observations[i] = state
+                    observations[i] = env.reset()
+        done_barrier.wait()
+
+
+class PongSubprocVecEnv:
+    """PongEnv N개를 worker 프로세스 여러 개로 나눠 진행하는 벡터 환경"""
+
+    def __init__(self, num_envs, num_workers=None, env_cls=FastPongEnv, timeout=60.0):
+        """
+        Args:
+            num_envs: 동시에 진행할 게임 수
+            num_workers: worker 프로세스 수 (None이면 CPU 코어 수, num_envs보다 많으면 num_envs)
+            env_cls: 게임 클래스 (PongEnv 또는 FastPongEnv)
+            timeout: worker 응답을 기다리는 최대 시간(초), 넘으면 worker가 죽은 것으로 보고 에러
+        """
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers or mp.cpu_count(), num_envs)
+        self.timeout = timeout
+        self.action_space_n = 3
+        self.observation_size = OBSERVATION_SIZE
+        self.closed = False
+        self._waiting = False
+
+        _, nbytes = _shared_arrays(None, num_envs)
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.arrays, _ = _shared_arrays(self.shm.buf, num_envs)
+
+        # spawn: 부모 프로세스 상태(스레드, torch 등)를 물려받지 않음 (Windows에서도 동작)
+        context = mp.get_context('spawn')
+        self._start_barrier = context.Barrier(self.num_workers + 1)
+        self._done_barrier = context.Barrier(self.num_workers + 1)
+        self._errors = context.Queue()  # worker 에러 메시지 (에러 날 때만 사용)
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        self.workers = [
+            context.Process(target=_worker_main, daemon=True,
+                            args=(w, int(bounds[w]), int(bounds[w + 1]), env_cls, self.shm.name, num_envs,
+                                  self._start_barrier, self._done_barrier, self._errors))
+            for w in range(self.num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_open(self):
+        if self.closed:
+            raise RuntimeError("이미 닫힌 환경입니다.")
+
+    def _wait(self, barrier):
+        """barrier에서 worker들을 기다림 (worker 에러/종료/시간 초과면 정리하고 RuntimeError)"""
+        try:
+            barrier.wait(self.timeout)
+        except BrokenBarrierError:
+            self._fail()
+
+    def _run(self, command):
+        """명령을 쓰고 worker들을 출발시킴"""
+        self.arrays['command'][0] = command
+        self._wait(self._start_barrier)
+
+    def _fail(self):
+        """barrier가 깨졌을 때: worker 정리 + shared memory 해제 후 원인을 담은 에러 발생"""
+        dead = [(w, worker.exitcode) for w, worker in enumerate(self.workers) if not worker.is_alive()]
+        self._start_barrier.abort()
+        self._done_barrier.abort()
+        self._shutdown(join_timeout=1)  # 멈춘 worker는 오래 기다리지 않고 강제 종료
+
+        reasons = []
+        while True:
+            try:
+                worker_id, message = self._errors.get(timeout=0.1)
+            except queue.Empty:
+                break
+            reasons.append(f"worker {worker_id} 에러:\n{message}")
+        if not reasons:
+            reasons = [f"worker {w}가 종료되었습니다 (exitcode {exitcode})" for w, exitcode in dead]
+        if not reasons:
+            reasons = [f"worker가 {self.timeout}초 동안 응답하지 않았습니다"]
+        raise RuntimeError("PongSubprocVecEnv 중단 - " + "\n".join(reasons))
+
+    def reset(self, seed=None):
+        """
+        모든 게임을 초기 상태로 리셋
+
+        Args:
+            seed: 주면 i번째 게임을 seed + i로 리셋
+        """
+        self._check_open()
+        self.arrays['seed'][0] = -1 if seed is None else seed
+        self._run(_RESET)
+        self._wait(self._done_barrier)
+        return self.arrays['observations'].copy()
+
+    def step_async(self, actions):
+        """행동을 shared memory에 쓰고 worker들이 진행을 시작하게 함 (기다리지 않고 바로 반환)"""
+        self._check_open()
+        np.copyto(self.arrays['actions'], actions, casting='unsafe')
+        self._run(_STEP)
+        self._waiting = True
+
+    def step_wait(self):
+        """
+        step_async로 시작한 진행이 끝날 때까지 기다려서 결과 반환
+
+        반환값: PongVecEnv.step과 같음
+        state : (num_envs, 10) float32 관측값 (끝난 게임은 리셋 후 상태)
+        reward : (num_envs,) float32 보상
+        done : (num_envs,) bool 에피소드 종료 여부
+        info : {'score': 종료 직전 점수, 'final_observation': 종료 직전 관측값(끝난 게임이 있을 때만)}
+        """
+        self._check_open()
+        self._waiting = False
+        self._wait(self._done_barrier)
+        done = self.arrays['dones'].copy()
+        info = {'score': self.arrays['scores'].copy()}
+        if done.any():
+            info['final_observation'] = self.arrays['final_observations'][done]
+        return self.arrays['observations'].copy(), self.arrays['rewards'].copy(), done, info
+
+    def step(self, actions):
+        """모든 게임을 한 프레임 진행 (step_async + step_wait)"""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        """worker 종료 + shared memory 해제"""
+        if self.closed:
+            return
+        try:
+            if self._waiting:
+                self._done_barrier.wait(self.timeout)
+            self.arrays['command'][0] = _CLOSE
+            self._start_barrier.wait(self.timeout)
+        except BrokenBarrierError:
+            pass  # 이미 멈춘 worker는 아래에서 강제 종료
+        self._shutdown()
+
+    def _shutdown(self, join_timeout=5):
+        """worker 종료(join_timeout초 안에 안 끝나면 강제 종료) + shared memory 해제"""
+        for worker in self.workers:
+            worker.join(timeout=join_timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self.arrays = None
+        self.shm.close()
+        self.shm.unlink()
+        self.closed = True
+
+
+# ====================================================================
+# 코어 수별 처리량 비교
+# ====================================================================
+if __name__ == "__main__":
+    import time
+
+    from numpy_qnet import NumpyQNet
+    from pong_vec_env import PongVecEnv
+
+    NUM_ENVS = 256
+    NUM_STEPS = 500
+    MODEL_PATH = 'pong_model.tflite'
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 3, size=(NUM_STEPS, NUM_ENVS))
+
+    def measure(step, reset):
+        """NUM_STEPS번 step한 steps/sec (게임 NUM_ENVS개 합계)"""
+        reset()
+        start_time = time.perf_counter()
+        for t in range(NUM_STEPS):
+            step(actions[t])
+        return NUM_ENVS * NUM_STEPS / (time.perf_counter() - start_time)
+
+    # 비교 기준: 한 프로세스에서 FastPongEnv를 차례로 / PongVecEnv(NumPy 배열 연산)
+    envs = [FastPongEnv() for _ in range(NUM_ENVS)]
+
+    def serial_step(step_actions):
+        for env, action in zip(envs, step_actions):
+            state, reward, done, info = env.step(int(action))
+            if done:
+                env.reset()
+
+    serial = measure(serial_step, lambda: [env.reset(seed=i) for i, env in enumerate(envs)])
+    vec_env = PongVecEnv(NUM_ENVS)
+    vectorized = measure(vec_env.step, lambda: vec_env.reset(seed=0))
+
+    print(f"\n게임 {NUM_ENVS}개 x {NUM_STEPS} 스텝 (CPU {mp.cpu_count()}개)")
+    print(f"{'방식':<26}{'steps/sec':>14}")
+    print("─" * 40)
+    print(f"{'FastPongEnv 차례로':<26}{serial:>14,.0f}")
+    print(f"{'PongVecEnv (NumPy)':<26}{vectorized:>14,.0f}")
+
+    worker_counts = sorted({1, 2, 4, 8, mp.cpu_count()} & set(range(1, mp.cpu_count() + 1)))
+    for num_workers in worker_counts:
+        with PongSubprocVecEnv(NUM_ENVS, num_workers) as env:
+            result = measure(env.step, lambda: env.reset(seed=0))
+        print(f"{f'subproc worker {num_workers}개':<26}{result:>14,.0f}")
+
+    # step_async/step_wait: worker가 진행하는 동안 다음 행동을 미리 추론 (행동은 한 스텝 늦게 반영)
+    qnet = NumpyQNet.load(MODEL_PATH)
+    with PongSubprocVecEnv(NUM_ENVS, worker_counts[-1]) as env:
+        state = env.reset(seed=0)
+
+        def sync_step(_):
+            global state
+            state, reward, done, info = env.step(qnet.forward(state).argmax(axis=1))
+
+        sync = measure(sync_step, lambda: None)
+
+        next_actions = qnet.forward(state).argmax(axis=1)
+
+        def async_step(_):
+            global state, next_actions
+            env.step_async(next_actions)
+            next_actions = qnet.forward(state).argmax(axis=1)  # 진행 중에 직전 관측값으로 추론
+            state, reward, done, info = env.step_wait()
+
+        overlapped = measure(async_step, lambda: None)
+    print(f"{'추론 + step (순서대로)':<26}{sync:>14,.0f}")
+    print(f"{'추론 + step (async 겹침)':<26}{overlapped:>14,.0f}")
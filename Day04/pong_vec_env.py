@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 개의 Pong 게임을 한 번에 진행하는 벡터 환경
+공/패들/타이머 상태를 NumPy 배열(struct-of-arrays)로 저장해서
+step 한 번에 수천 개의 게임을 동시에 진행 (DQN 데이터 수집용)
+"""
+
+import numpy as np
+
+from wlqrkrhtlvek1 import PongEnv
+
+
+class PongVecEnv:
+    """PongEnv N개를 배열 연산으로 동시에 진행하는 헤드리스 환경"""
+
+    def __init__(self, num_envs):
+        """
+        Args:
+            num_envs: 동시에 진행할 게임 수
+        """
+        # 게임 설정은 PongEnv와 공유 (규칙이 어긋나지 않도록)
+        base = PongEnv()
+        self.num_envs = num_envs
+        self.paddle_width = base.paddle_width
+        self.ball_speed_min = base.ball_speed_min
+        self.ball_speed_max = base.ball_speed_max
+        self.paddle_speed_min = base.paddle_speed_min
+        self.paddle_speed_max = base.paddle_speed_max
+        self.target_fps = base.target_fps
+        self.ball2_delay = base.ball2_delay
+
+        # 액션 스페이스와 관측 스페이스 정의
+        self.action_space_n = base.action_space_n
+        self.observation_size = 10
+
+        # 게임별 상태 (인덱스 i = i번째 게임)
+        self.ball_x = np.zeros(num_envs)
+        self.ball_y = np.zeros(num_envs)
+        self.ball_dx = np.zeros(num_envs)
+        self.ball_dy = np.zeros(num_envs)
+        self.ball2_x = np.zeros(num_envs)
+        self.ball2_y = np.zeros(num_envs)
+        self.ball2_dx = np.zeros(num_envs)
+        self.ball2_dy = np.zeros(num_envs)
+        self.ball2_active = np.zeros(num_envs, dtype=bool)
+        self.ball2_timer = np.zeros(num_envs)
+        self.ball1_missed = np.zeros(num_envs, dtype=bool)
+        self.ball2_missed = np.zeros(num_envs, dtype=bool)
+        self.paddle_x = np.zeros(num_envs)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.misses = np.zeros(num_envs, dtype=np.int64)
+
+        # 환경 전용 난수 생성기 (reset(seed=...)로 고정)
+        self.np_random = None
+
+    def reset(self, seed=None):
+        """
+        모든 게임을 초기 상태로 리셋
+
+        Args:
+            seed: 주면 난수 생성기를 다시 설정 (같은 seed, 같은 num_envs면 같은 진행)
+        """
+        if seed is not None or self.np_random is None:
+            self.np_random = np.random.default_rng(seed)
+        self._reset_lanes(np.ones(self.num_envs, dtype=bool))
+        return self._get_state()
+
+    def _reset_lanes(self, mask):
+        """mask가 True인 게임만 PongEnv.reset과 같은 초기 상태로 되돌림"""
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return
+
+        serve = [-self.ball_speed_min, self.ball_speed_min]
+        self.ball_x[mask] = 0.5
+        self.ball_y[mask] = 0.1
+        self.paddle_x[mask] = 0.5
+        self.ball_dx[mask] = self.np_random.choice(serve, size=n)  # 좌우 랜덤
+        self.ball_dy[mask] = self.ball_speed_min
+
+        # 두 번째 공 초기화 (딜레이 적용)
+        self.ball2_x[mask] = 0.5
+        self.ball2_y[mask] = 0.2
+        self.ball2_dx[mask] = self.np_random.choice(serve, size=n)
+        self.ball2_dy[mask] = self.ball_speed_min
+        self.ball2_active[mask] = False
+        self.ball2_timer[mask] = 0.0
+        self.ball1_missed[mask] = False
+        self.ball2_missed[mask] = False
+
+        self.score[mask] = 0
+        self.misses[mask] = 0
+
+    def step(self, actions):
+        """
+        모든 게임을 한 프레임 진행 (규칙은 PongEnv.step과 동일)
+
+        Args:
+            actions: (num_envs,) 정수 배열, 0=왼쪽 / 1=정지 / 2=오른쪽
+
+        반환값:
+        state : (num_envs, 10) float32 관측값 (끝난 게임은 리셋 후 상태)
+        reward : (num_envs,) float32 보상
+        done : (num_envs,) bool 에피소드 종료 여부
+        info : {'score': 종료 직전 점수, 'final_observation': 종료 직전 관측값(끝난 게임이 있을 때만)}
+        """
+        actions = np.asarray(actions)
+
+        # 점수에 따라 속도 증가 (PongEnv와 같은 1000000점 선형 곡선)
+        speed_ratio = np.minimum(self.score / 1000000, 1.0)
+        ball_speed = self.ball_speed_min + (self.ball_speed_max - self.ball_speed_min) * speed_ratio
+        paddle_speed = self.paddle_speed_min + (self.paddle_speed_max - self.paddle_speed_min) * speed_ratio
+        # 방향 유지 (np.sign(d) * speed와 같은 값)
+        np.copysign(ball_speed, self.ball_dx, out=self.ball_dx)
+        np.copysign(ball_speed, self.ball_dy, out=self.ball_dy)
+        np.copysign(ball_speed, self.ball2_dx, out=self.ball2_dx)
+        np.copysign(ball_speed, self.ball2_dy, out=self.ball2_dy)
+
+        # 두 번째 공 딜레이 처리
+        inactive = ~self.ball2_active
+        np.add(self.ball2_timer, 1.0 / self.target_fps, out=self.ball2_timer, where=inactive)
+        self.ball2_active |= inactive & (self.ball2_timer >= self.ball2_delay)
+        active = self.ball2_active
+
+        # 패들 이동 + 화면 밖으로 나가지 않도록 제한
+        self.paddle_x -= np.where(actions == 0, paddle_speed, 0.0)
+        self.paddle_x += np.where(actions == 2, paddle_speed, 0.0)
+        np.clip(self.paddle_x, 0.0, 1.0, out=self.paddle_x)
+
+        # 공 이동 (두 번째 공은 활성화된 게임만)
+        self.ball_x += self.ball_dx
+        self.ball_y += self.ball_dy
+        np.add(self.ball2_x, self.ball2_dx, out=self.ball2_x, where=active)
+        np.add(self.ball2_y, self.ball2_dy, out=self.ball2_y, where=active)
+
+        reward = np.zeros(self.num_envs, dtype=np.float32)
+        done = np.zeros(self.num_envs, dtype=bool)
+
+        # 좌우 벽 충돌
+        np.negative(self.ball_dx, out=self.ball_dx,
+                    where=(self.ball_x <= 0.0) | (self.ball_x >= 1.0))
+        np.negative(self.ball2_dx, out=self.ball2_dx,
+                    where=active & ((self.ball2_x <= 0.0) | (self.ball2_x >= 1.0)))
+
+        # 위쪽 벽 충돌
+        np.negative(self.ball_dy, out=self.ball_dy, where=self.ball_y <= 0.0)
+        np.negative(self.ball2_dy, out=self.ball2_dy, where=active & (self.ball2_y <= 0.0))
+
+        # 패들 충돌 및 점수 (첫 번째 공 → 두 번째 공 순서도 PongEnv와 동일)
+        self._paddle_check(self.ball_x, self.ball_y, self.ball_dx, self.ball_dy,
+                           self.ball1_missed, ~self.ball1_missed, reward, done)
+        self._paddle_check(self.ball2_x, self.ball2_y, self.ball2_dx, self.ball2_dy,
+                           self.ball2_missed, active & ~self.ball2_missed, reward, done)
+
+        # 두 공 모두 놓쳐야 게임오버
+        done |= self.ball1_missed & self.ball2_missed
+
+        state = self._get_state()
+        info = {
+            'score': self.score.copy(),
+        }
+
+        # 끝난 게임은 그 자리에서 리셋
+        if done.any():
+            info['final_observation'] = state[done]
+            self._reset_lanes(done)
+            state[done] = self._get_state()[done]
+
+        return state, reward, done, info
+
+    def _paddle_check(self, x, y, dx, dy, missed, candidates, reward, done):
+        """공 하나에 대한 패들 충돌/점수 처리 (배열은 제자리에서 갱신)"""
+        at_paddle = candidates & (y >= 0.95)
+        if not at_paddle.any():
+            return
+
+        hit = at_paddle & (np.abs(x - self.paddle_x) <= self.paddle_width / 2)
+        miss = at_paddle & ~hit
+
+        hit_idx = np.flatnonzero(hit)
+        if hit_idx.size:
+            dy[hit_idx] *= -1
+            # x방향 랜덤화
+            dx[hit_idx] = self.np_random.choice([-1.0, 1.0], size=hit_idx.size) * np.abs(dx[hit_idx])
+            self.score[hit_idx] += 1
+            reward[hit_idx] += 1.0
+            # 10000점 초과 시 0.0001% 확률로 즉시 게임오버
+            lucky = hit_idx[self.score[hit_idx] > 10000]
+            if lucky.size:
+                done[lucky[self.np_random.random(lucky.size) < 0.000001]] = True
+
+        self.misses += miss
+        reward[miss] -= 1.0
+        missed |= miss
+
+    def _get_state(self):
+        """(num_envs, 10) 관측값 배열 (PongEnv._get_state와 같은 순서)"""
+        state = np.empty((self.num_envs, self.observation_size), dtype=np.float32)
+        state[:, 0] = self.ball_x
+        state[:, 1] = self.ball_y
+        state[:, 2] = self.ball2_x
+        state[:, 3] = self.ball2_y
+        state[:, 4] = self.paddle_x
+        state[:, 5] = self.ball_dx
+        state[:, 6] = self.ball_dy
+        state[:, 7] = self.ball2_dx
+        state[:, 8] = self.ball2_dy
+        state[:, 9] = self.ball2_active
+        return state
+
+
+# ====================================================================
+# 테스트 코드
+# ====================================================================
+if __name__ == "__main__":
+    import time
+
+    num_envs = 4096
+    num_steps = 1000
+
+    env = PongVecEnv(num_envs)
+    state = env.reset()
+    print(f"관측값 형태: {state.shape}")
+
+    episodes = 0
+    start_time = time.time()
+    for _ in range(num_steps):
+        # 랜덤 에이전트
+        actions = np.random.randint(0, env.action_space_n, size=num_envs)
+        state, reward, done, info = env.step(actions)
+        episodes += int(done.sum())
+    elapsed = time.time() - start_time
+
+    print(f"{num_envs}개 게임 x {num_steps} 스텝: {elapsed:.2f}초")
+    print(f"처리량: {num_envs * num_steps / elapsed:,.0f} steps/sec")
+    print(f"종료된 에피소드: {episodes}")
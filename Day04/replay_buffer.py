@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DQN 학습용 리플레이 버퍼 (미리 할당한 배열 링 버퍼)
+관측값/행동/보상/종료 여부를 자료형별 NumPy 배열에 저장해서
+deque + 파이썬 튜플보다 메모리가 작고, 여러 게임의 전이를 한 번에 넣고 꺼낼 수 있음
+
+path를 주면 np.memmap(.npy 파일)에 저장해서 RAM보다 큰 버퍼를 쓰거나
+학습을 멈췄다가 같은 path로 다시 만들어서 이어서 학습할 수 있음
+"""
+
+import json
+import os
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+
+class ReplayBuffer:
+    """(상태, 행동, 보상, 다음 상태, 종료) 고정 크기 링 버퍼"""
+
+    # 필드 이름 → (자료형, 관측값 크기만큼 열이 있는지)
+    FIELDS = {
+        'states': (np.float32, True),
+        'actions': (np.uint8, False),
+        'rewards': (np.float32, False),
+        'next_states': (np.float32, True),
+        'dones': (np.bool_, False),
+    }
+
+    def __init__(self, capacity, observation_size=10, batch_size=64, path=None, seed=None):
+        """
+        Args:
+            capacity: 저장할 최대 전이 수 (넘으면 오래된 것부터 덮어씀)
+            observation_size: 관측값 크기 (PongEnv는 10)
+            batch_size: sample()이 기본으로 꺼낼 개수 (출력 배열을 미리 만들어 둠)
+            path: 주면 이 폴더의 .npy 파일을 np.memmap으로 사용 (meta.json이 있으면 이어서 사용,
+                  meta.json 없이 .npy 파일만 있으면 덮어쓰지 않고 FileExistsError)
+            seed: 샘플링 난수 시드
+        """
+        self.capacity = capacity
+        self.observation_size = observation_size
+        self.path = path
+        self.rng = np.random.default_rng(seed)
+        self.position = 0  # 다음에 쓸 칸
+        self.size = 0  # 저장된 전이 수
+
+        if path is None:
+            self.storage = {name: np.zeros(self._shape(columns, capacity), dtype=dtype)
+                            for name, (dtype, columns) in self.FIELDS.items()}
+        else:
+            self.storage = self._open_memmap(path)
+        for name, array in self.storage.items():
+            setattr(self, name, array)
+
+        self._set_batch_size(batch_size)
+
+    def _shape(self, columns, rows):
+        return (rows, self.observation_size) if columns else (rows,)
+
+    def _open_memmap(self, path):
+        """
+        path 폴더의 필드별 .npy 파일을 memmap으로 열기 (없으면 만들고, 있으면 저장된 위치부터 이어서)
+        만들 때 meta.json도 바로 써 둬서, 다시 열 때 meta.json이 없는 .npy 파일은 다른 데이터로 보고 거부
+        """
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        resume = os.path.exists(meta_path)
+        if not resume:
+            existing = [f'{name}.npy' for name in self.FIELDS if os.path.exists(os.path.join(path, f'{name}.npy'))]
+            if existing:
+                raise FileExistsError(f"{path}에 meta.json 없이 {', '.join(existing)}가 있습니다 "
+                                      f"(덮어쓰지 않음, 지우거나 다른 path를 사용하세요).")
+        else:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta['capacity'], meta['observation_size']) != (self.capacity, self.observation_size):
+                raise ValueError(f"저장된 버퍼 크기({meta['capacity']}, {meta['observation_size']})가 "
+                                 f"요청한 크기({self.capacity}, {self.observation_size})와 다릅니다.")
+            self.position = meta['position']
+            self.size = meta['size']
+
+        storage = {}
+        for name, (dtype, columns) in self.FIELDS.items():
+            file_path = os.path.join(path, f'{name}.npy')
+            if resume:
+                storage[name] = np.load(file_path, mmap_mode='r+')
+            else:
+                storage[name] = np.lib.format.open_memmap(file_path, mode='w+', dtype=dtype,
+                                                          shape=self._shape(columns, self.capacity))
+        if not resume:
+            self._write_meta()
+        return storage
+
+    def _set_batch_size(self, batch_size):
+        """샘플링 출력 배열 (sample()마다 새로 만들지 않고 재사용)"""
+        self.batch_size = batch_size
+        self._uniform = np.empty(batch_size)
+        self._indices = np.empty(batch_size, dtype=np.int64)
+        self._batch = {name: np.empty(self._shape(columns, batch_size), dtype=dtype)
+                       for name, (dtype, columns) in self.FIELDS.items()}
+
+    def __len__(self):
+        return self.size
+
+    def add(self, states, actions, rewards, next_states, dones):
+        """
+        전이 추가 (게임 하나의 전이 또는 [B, ...] 여러 게임의 전이를 한 번에)
+
+        PongVecEnv처럼 끝난 게임을 자동으로 리셋하는 환경은 next_states의 끝난 게임 자리에
+        info['final_observation']을 넣어서 전달
+        """
+        states = np.asarray(states, dtype=np.float32).reshape(-1, self.observation_size)
+        batch = len(states)
+        values = {
+            'states': states,
+            'actions': np.broadcast_to(np.asarray(actions), (batch,)),
+            'rewards': np.broadcast_to(np.asarray(rewards), (batch,)),
+            'next_states': np.asarray(next_states, dtype=np.float32).reshape(-1, self.observation_size),
+            'dones': np.broadcast_to(np.asarray(dones), (batch,)),
+        }
+        if batch > self.capacity:  # 버퍼보다 많으면 마지막 capacity개만 남음
+            values = {name: value[-self.capacity:] for name, value in values.items()}
+            batch = self.capacity
+
+        # 링 끝을 넘으면 두 조각으로 나눠서 슬라이스 대입 (인덱스 배열을 만들지 않음)
+        first = min(batch, self.capacity - self.position)
+        for name, value in values.items():
+            array = self.storage[name]
+            array[self.position:self.position + first] = value[:first]
+            if first < batch:
+                array[:batch - first] = value[first:]
+        self.position = (self.position + batch) % self.capacity
+        self.size = min(self.size + batch, self.capacity)
+
+    def sample(self, batch_size=None):
+        """
+        균등 샘플링 (O(batch_size))
+
+        Returns:
+            (states, actions, rewards, next_states, dones) 배열
+            매번 같은 출력 배열을 덮어쓰므로 보관하려면 복사해서 사용
+        """
+        if batch_size is not None and batch_size != self.batch_size:
+            self._set_batch_size(batch_size)
+        if self.size == 0:
+            raise ValueError("버퍼가 비어 있습니다.")
+
+        # [0, size) 정수 인덱스를 미리 만든 배열에 생성
+        self.rng.random(out=self._uniform)
+        self._uniform *= self.size
+        np.copyto(self._indices, self._uniform, casting='unsafe')
+
+        for name, out in self._batch.items():
+            np.take(self.storage[name], self._indices, axis=0, out=out)
+        return tuple(self._batch[name] for name in self.FIELDS)
+
+    def flush(self):
+        """memmap 버퍼를 디스크에 쓰고 현재 위치 저장 (이어서 학습할 때 필요)"""
+        if self.path is None:
+            return
+        for array in self.storage.values():
+            array.flush()
+        self._write_meta()
+
+    def _write_meta(self):
+        """버퍼 크기와 현재 위치를 path/meta.json에 저장"""
+        with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'capacity': self.capacity, 'observation_size': self.observation_size,
+                       'position': self.position, 'size': self.size}, f)
+
+    @property
+    def nbytes(self):
+        """저장 배열 전체 크기 (bytes)"""
+        return sum(array.nbytes for array in self.storage.values())
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    우선순위 리플레이 버퍼 (비례 방식, 합 트리)
+
+    합 트리는 1차원 배열 하나에 저장 (1번이 루트, i번의 자식은 2i, 2i+1, 잎은 tree_size~2*tree_size-1)
+    샘플링/우선순위 갱신은 배치 전체를 트리 한 층씩 배열 연산으로 처리해서 O(배치 * log N)
+    """
+
+    def __init__(self, capacity, observation_size=10, batch_size=64, path=None, seed=None,
+                 alpha=0.6, epsilon=1e-3):
+        """
+        Args:
+            capacity, observation_size, batch_size, path, seed: ReplayBuffer와 같음
+                (path로 이어서 학습하면 우선순위는 저장하지 않으므로 저장된 전이 모두 같은 값으로 시작)
+            alpha: 우선순위 지수 (0이면 균등 샘플링, 1이면 TD 오차에 비례)
+            epsilon: TD 오차가 0이어도 뽑힐 수 있도록 더하는 값
+        """
+        super().__init__(capacity, observation_size, batch_size, path, seed)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.max_priority = 1.0  # 새 전이는 지금까지 가장 큰 우선순위로 넣음 (최소 한 번은 학습)
+
+        self.tree_size = 1
+        while self.tree_size < capacity:
+            self.tree_size *= 2
+        self.depth = self.tree_size.bit_length() - 1  # 루트에서 잎까지 층 수
+        self.tree = np.zeros(2 * self.tree_size)
+        if self.size:
+            self._set_priorities(np.arange(self.size), self.max_priority)
+
+    def _set_priorities(self, indices, priorities):
+        """잎 값을 바꾸고 부모 합을 한 층씩 다시 계산 (같은 부모가 여러 번 나와도 같은 값이 들어감)"""
+        nodes = indices + self.tree_size
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes //= 2
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def _set_batch_size(self, batch_size):
+        super()._set_batch_size(batch_size)
+        self._strata = np.arange(batch_size)  # 샘플링 구간 번호
+
+    @property
+    def total_priority(self):
+        return self.tree[1]
+
+    def add(self, states, actions, rewards, next_states, dones):
+        """전이 추가 (ReplayBuffer.add와 같음), 새 전이의 우선순위는 max_priority"""
+        start = self.position
+        super().add(states, actions, rewards, next_states, dones)
+        batch = min(np.asarray(states).size // self.observation_size, self.capacity)
+        indices = (start + np.arange(batch)) % self.capacity
+        self._set_priorities(indices, self.max_priority)
+
+    def sample(self, batch_size=None, beta=0.4):
+        """
+        우선순위에 비례해서 샘플링 (전체 합을 batch_size 구간으로 나눠 구간마다 하나씩)
+
+        Args:
+            batch_size: 꺼낼 개수 (None이면 만들 때 정한 값)
+            beta: 중요도 샘플링 보정 지수 (학습이 진행될수록 1로 올림)
+
+        Returns:
+            (states, actions, rewards, next_states, dones, weights, indices)
+            weights: 중요도 샘플링 가중치 (배치 안 최댓값이 1), indices: update_priorities에 넘길 위치
+            ReplayBuffer.sample처럼 출력 배열은 매번 덮어씀
+        """
+        if batch_size is not None and batch_size != self.batch_size:
+            self._set_batch_size(batch_size)
+        if self.size == 0:
+            raise ValueError("버퍼가 비어 있습니다.")
+        batch_size = self.batch_size
+
+        # 구간마다 [i, i+1) / batch_size 위치의 누적 우선순위 값
+        total = self.total_priority
+        values = self._uniform
+        self.rng.random(out=values)
+        values += self._strata
+        values *= total / batch_size
+
+        # 루트에서 잎까지 한 층씩: 왼쪽 자식 합보다 크면 오른쪽으로 (값에서 왼쪽 합을 뺌)
+        nodes = np.ones(batch_size, dtype=np.int64)
+        for _ in range(self.depth):
+            nodes *= 2
+            left = self.tree[nodes]
+            right = values >= left
+            values -= left * right
+            nodes += right
+        indices = self._indices
+        np.subtract(nodes, self.tree_size, out=indices)
+        # 부동소수점 오차로 빈 칸(우선순위 0)에 떨어지면 마지막 전이로
+        np.minimum(indices, self.size - 1, out=indices)
+
+        for name, out in self._batch.items():
+            np.take(self.storage[name], indices, axis=0, out=out)
+
+        # 중요도 샘플링 가중치 (N * P(i))^-beta, 배치 최댓값으로 나눔
+        probabilities = self.tree[indices + self.tree_size] / total
+        weights = (self.size * probabilities) ** -beta
+        weights /= weights.max()
+        return tuple(self._batch[name] for name in self.FIELDS) + (weights.astype(np.float32), indices)
+
+    def update_priorities(self, indices, td_errors):
+        """학습 후 샘플한 전이들의 우선순위를 |TD 오차|로 갱신 (배치 한 번에)"""
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self._set_priorities(np.asarray(indices, dtype=np.int64).copy(), priorities)
+
+
+# ====================================================================
+# deque + 튜플 방식과 비교 (PongVecEnv로 수집)
+# ====================================================================
+if __name__ == "__main__":
+    try:
+        import resource  # 최대 RSS 측정 (Linux/macOS)
+    except ImportError:
+        resource = None
+
+    from pong_vec_env import PongVecEnv
+
+    NUM_ENVS = 1024
+    NUM_TRANSITIONS = 1_000_000
+    BATCH_SIZE = 64
+    NUM_SAMPLES = 2000
+
+    env = PongVecEnv(NUM_ENVS)
+    rng = np.random.default_rng(0)
+
+    def collect(add):
+        """NUM_TRANSITIONS개를 수집하면서 add(states, actions, rewards, next_states, dones) 호출"""
+        state = env.reset(seed=0)
+        for _ in range(NUM_TRANSITIONS // NUM_ENVS):
+            actions = rng.integers(0, env.action_space_n, size=NUM_ENVS)
+            next_state, reward, done, info = env.step(actions)
+            real_next = next_state.copy()
+            if done.any():
+                real_next[done] = info['final_observation']
+            add(state, actions, reward, real_next, done)
+            state = next_state
+
+    def peak_memory():
+        """지금까지의 최대 RSS (bytes, Linux 기준, 측정할 수 없으면 0)"""
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    # deque + 튜플 (전이 하나씩), 메모리는 수집 전후 최대 RSS 차이
+    memory_before = peak_memory()
+    memory = deque(maxlen=NUM_TRANSITIONS)
+
+    def add_tuples(states, actions, rewards, next_states, dones):
+        for transition in zip(states, actions, rewards, next_states, dones):
+            memory.append(transition)
+
+    start_time = time.perf_counter()
+    collect(add_tuples)
+    deque_insert = time.perf_counter() - start_time
+    deque_memory = peak_memory() - memory_before
+    start_time = time.perf_counter()
+    for _ in range(NUM_SAMPLES):
+        batch = random.sample(memory, BATCH_SIZE)
+        states, actions, rewards, next_states, dones = map(np.array, zip(*batch))
+    deque_sample = time.perf_counter() - start_time
+    del memory, batch
+
+    # 배열 링 버퍼 (게임 NUM_ENVS개 한 번에)
+    buffer = ReplayBuffer(NUM_TRANSITIONS, batch_size=BATCH_SIZE, seed=0)
+    start_time = time.perf_counter()
+    collect(buffer.add)
+    buffer_insert = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _ in range(NUM_SAMPLES):
+        states, actions, rewards, next_states, dones = buffer.sample()
+    buffer_sample = time.perf_counter() - start_time
+
+    print(f"\n전이 {len(buffer):,}개 (게임 {NUM_ENVS}개 동시 수집), 배치 {BATCH_SIZE}")
+    print(f"{'방식':<14}{'메모리':>10}{'수집+저장':>12}{'샘플링(1회)':>14}")
+    print("─" * 50)
+    print(f"{'deque+튜플':<14}{deque_memory / 2**20:>8.0f}MB{deque_insert:>11.2f}s"
+          f"{deque_sample / NUM_SAMPLES * 1e6:>12.1f}us")
+    print(f"{'ReplayBuffer':<14}{buffer.nbytes / 2**20:>8.0f}MB{buffer_insert:>11.2f}s"
+          f"{buffer_sample / NUM_SAMPLES * 1e6:>12.1f}us")
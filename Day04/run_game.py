@@ -3,50 +3,206 @@
 """
 랩탑용 테스트 Pong AI 게임
 Frame Skip 적용 + TFLite 모델 사용
+추론 라이브러리(tflite_runtime/tensorflow)는 PongAgent를 만들 때만 import
 """
 
-import numpy as np
-import tensorflow as tf  # ← 라즈베리파이와 다른 부분
 import time
+_START_TIME = time.perf_counter()  # --profile-startup용 (프로그램 시작 시각)
+
+import argparse
+import math
+import numpy as np
 import sys
 import os
+import threading
+
+# wlqrkrhtlvek1.py에서 PongEnv 임포트
+from wlqrkrhtlvek1 import PongEnv
+from latency_stats import LatencyStats
+from frame_trace import FrameTrace
+from fixed_timestep import FixedTimestep
+from video_recorder import VideoRecorder
 
-# pong_game.py에서 PongEnv 임포트
-from pong_game import PongEnv
+_IMPORT_TIME = (time.perf_counter() - _START_TIME) * 1000  # 기본 모듈 import 시간 (ms)
+
+
+def load_inference_backend(backend='auto'):
+    """
+    추론 백엔드를 찾아서 (이름, Interpreter 클래스) 반환
+    tflite_runtime → tensorflow.lite → numpy 순서로 시도하고, 처음 성공한 것만 import
+    numpy 백엔드는 Interpreter 클래스 대신 None을 반환
+    
+    Args:
+        backend: 'auto'(순서대로 시도), 'tflite'(TFLite만), 'numpy'(NumPy만)
+    """
+    if backend != 'numpy':
+        try:
+            from tflite_runtime.interpreter import Interpreter  # 라즈베리파이
+            return 'tflite_runtime', Interpreter
+        except ImportError:
+            pass
+        try:
+            import tensorflow as tf  # 랩탑 (import가 가장 무거움)
+            return 'tensorflow', tf.lite.Interpreter
+        except ImportError:
+            if backend == 'tflite':
+                raise ImportError("tflite_runtime 또는 tensorflow가 설치되어 있지 않습니다.")
+    return 'numpy', None
 
 
 class PongAgent:
     """Frame Skip이 적용된 TFLite AI 에이전트"""
     
-    def __init__(self, model_path, frame_skip=4):
+    def __init__(self, model_path, frame_skip=4, backend='auto', num_threads=None,
+                 adaptive_skip=False, target_fps=120, min_skip=1, max_skip=8,
+                 inference_mode='skip', async_inference=False):
         """
         Args:
-            model_path: TFLite 모델 파일 경로
-            frame_skip: N 프레임마다 한 번 추론 (기본값: 4)
+            model_path: 모델 파일 경로 (.tflite, numpy 백엔드는 .npz/.pth도 가능,
+                        table 백엔드는 policy_table.py로 만든 정책 표 .npz)
+            frame_skip: N 프레임마다 한 번 추론 (기본값: 4, 적응형이면 시작값)
+            backend: 'auto'(tflite_runtime → tensorflow → numpy 순서로 시도),
+                     'tflite'(TFLite 인터프리터만), 'numpy'(NumPy 행렬 곱) 또는
+                     'table'(미리 계산한 정책 표 조회, 추론 없음)
+            num_threads: TFLite 스레드 수 (None이면 라이브러리 기본값)
+            adaptive_skip: True면 추론 시간과 프레임 예산(1/target_fps)을 보고
+                           frame skip을 min_skip~max_skip 사이에서 자동 조절
+            target_fps: 목표 FPS (프레임 예산 계산용)
+            min_skip, max_skip: 적응형 frame skip 범위
+            inference_mode: 'skip'(N프레임마다 추론) 또는
+                            'event'(공 방향 전환/아래 영역 진입/두 번째 공 등장/관측값 변화가 클 때만 추론)
+            async_inference: True면 백그라운드 스레드가 인터프리터를 맡아 추론하고
+                             get_action은 기다리지 않고 가장 최근에 끝난 행동을 반환
+                             (적응형 frame skip은 사용하지 않음)
         """
         print(f"AI 에이전트 초기화")
         
-        # TFLite 인터프리터 로드 (랩탑용)
-        self.interpreter = tf.lite.Interpreter(model_path=model_path)
-        self.interpreter.allocate_tensors()
+        # 시작 시간 측정 (--profile-startup)
+        self.startup_times = {}
+        start_time = time.perf_counter()
+        if backend == 'table':
+            self.backend, interpreter_cls = 'table', None
+        else:
+            self.backend, interpreter_cls = load_inference_backend(backend)
         
-        # 입/출력 텐서 정보
-        self.input_details = self.interpreter.get_input_details()
-        self.output_details = self.interpreter.get_output_details()
+        self.batch_size = 1
+        self.table = None
+        if self.backend == 'table':
+            # 정책 표 (격자 칸 번호 계산 + 표 조회만으로 행동 선택)
+            from policy_table import PolicyTable
+            self.startup_times['backend_import'] = (time.perf_counter() - start_time) * 1000
+            start_time = time.perf_counter()
+            self.interpreter = None
+            self.qnet = None
+            self.table = PolicyTable.load(model_path)
+            self.startup_times['model_load'] = (time.perf_counter() - start_time) * 1000
+            self.startup_times['allocate_tensors'] = 0.0
+            self.num_features = 10
+            input_shape = [1, self.num_features]
+            output_shape = [1, 3]
+        elif interpreter_cls is None:
+            # NumPy 백엔드 (가중치만 읽어서 행렬 곱으로 계산)
+            from numpy_qnet import NumpyQNet
+            self.startup_times['backend_import'] = (time.perf_counter() - start_time) * 1000
+            start_time = time.perf_counter()
+            self.interpreter = None
+            self.qnet = NumpyQNet.load(model_path)
+            self.startup_times['model_load'] = (time.perf_counter() - start_time) * 1000
+            self.startup_times['allocate_tensors'] = 0.0
+            self.num_features = self.qnet.input_size
+            input_shape = [1, self.qnet.input_size]
+            output_shape = [1, self.qnet.output_size]
+        else:
+            self.startup_times['backend_import'] = (time.perf_counter() - start_time) * 1000
+            
+            # TFLite 인터프리터 로드
+            self.qnet = None
+            start_time = time.perf_counter()
+            if num_threads is None:
+                self.interpreter = interpreter_cls(model_path=model_path)
+            else:
+                self.interpreter = interpreter_cls(model_path=model_path, num_threads=num_threads)
+            self.startup_times['model_load'] = (time.perf_counter() - start_time) * 1000
+            start_time = time.perf_counter()
+            self.interpreter.allocate_tensors()
+            self.startup_times['allocate_tensors'] = (time.perf_counter() - start_time) * 1000
+            
+            # 입/출력 텐서 정보
+            self.input_details = self.interpreter.get_input_details()
+            self.output_details = self.interpreter.get_output_details()
+            self.input_index = self.input_details[0]['index']
+            self.output_index = self.output_details[0]['index']
+            self.num_features = int(self.input_details[0]['shape'][1])
+            self.batch_size = int(self.input_details[0]['shape'][0])
+            # 출력 텐서를 복사 없이 읽는 함수 (반환된 배열은 invoke 전에 버려야 함)
+            self.output_tensor = self.interpreter.tensor(self.output_index)
+            input_shape = self.input_details[0]['shape']
+            output_shape = self.output_details[0]['shape']
+
+        # 환경의 관측값 버퍼를 [1, N] 모양으로 본 뷰 (같은 버퍼면 재사용)
+        self._state_source = None
+        self._input_view = None
         
         # Frame skip 설정
         self.frame_skip = frame_skip
         self.frame_count = 0
+        self.next_inference_frame = frame_skip  # 다음 추론할 프레임 번호
         self.last_action = 1  # 초기 행동 (정지)
         
+        # 적응형 Frame skip 설정
+        self.adaptive_skip = adaptive_skip
+        self.min_skip = min_skip
+        self.max_skip = max_skip
+        self.frame_budget = 1000.0 / target_fps  # 프레임당 시간 예산 (ms)
+        self.inference_share = 0.25  # 추론이 프레임 예산에서 쓸 수 있는 비율 (나머지는 게임/렌더링)
+        self.deadline_slack = 0.2  # 예산보다 20% 넘게 걸린 프레임을 데드라인 초과로 봄
+        self.narrow_after = 8  # 데드라인 초과 없이 이만큼 추론하면 간격을 한 칸 좁힘
+        self.latency_ema = None  # 최근 추론 시간 (지수 이동 평균, ms)
+        self.skip_changes = 0
+        self.missed_deadlines = 0
+        self._recent_misses = 0
+        self._clean_windows = 0
+        self._last_frame_time = None
+        self._frame_hook = False  # play_episodes가 화면 프레임마다 end_frame()을 부르면 True
+        
+        # 이벤트 기반 추론 설정 (inference_mode='event')
+        self.inference_mode = inference_mode
+        self.lower_region = 0.6  # 공 y가 이 값 이상이면 패들 근처(아래 영역)
+        self.delta_threshold = 0.25  # 마지막 추론 이후 관측값이 이만큼 바뀌면 추론
+        self.lower_delta_threshold = 0.1  # 공이 아래 영역에서 내려오는 중일 때의 기준 (더 자주 추론)
+        self.trigger_counts = {'start': 0, 'ball2': 0, 'direction': 0, 'lower_region': 0, 'delta': 0}
+        self._last_obs = None  # 마지막으로 추론한 관측값
+        
         # 성능 모니터링
-        self.inference_times = []
+        self.inference_stats = LatencyStats()  # 추론 시간 통계 (메모리 고정)
+        self.stats_window = 10.0  # get_stats의 "최근 N초" 구간 (초)
         self.total_inferences = 0
+        # 배치 추론 모니터링 (get_actions)
+        self.total_batches = 0
+        self.total_batch_samples = 0
+        self.total_batch_time = 0.0
+        self.last_batch_stats = None
+        # get_actions와 백그라운드 스레드가 인터프리터를 동시에 쓰지 않도록
+        self._predict_lock = threading.Lock()
+        
+        # 비동기 추론 (async_inference=True)
+        self.async_inference = async_inference
+        self._worker = None
+        if async_inference:
+            self._start_worker()
         
         print(f" AI 로드 완료")
-        print(f"   └─ Frame skip: {frame_skip} (매 {frame_skip}프레임마다 추론)")
-        print(f"   └─ 입력 shape: {self.input_details[0]['shape']}")
-        print(f"   └─ 출력 shape: {self.output_details[0]['shape']}")
+        print(f"   └─ 백엔드: {self.backend}")
+        if inference_mode == 'event':
+            print(f"   └─ 추론 방식: 이벤트 기반 (상태 변화가 있을 때만 추론)")
+        elif adaptive_skip:
+            print(f"   └─ Frame skip: 적응형 {min_skip}~{max_skip} (시작 {frame_skip}, 목표 {target_fps} FPS)")
+        else:
+            print(f"   └─ Frame skip: {frame_skip} (매 {frame_skip}프레임마다 추론)")
+        if async_inference:
+            print(f"   └─ 비동기 추론: 백그라운드 스레드 (게임 루프는 추론을 기다리지 않음)")
+        print(f"   └─ 입력 shape: {input_shape}")
+        print(f"   └─ 출력 shape: {output_shape}")
         
     def get_action(self, state):
         """
@@ -60,47 +216,341 @@ class PongAgent:
         """
         self.frame_count += 1
         
-        # Frame skip: N프레임마다 한 번만 추론
-        if self.frame_count % self.frame_skip == 0:
-            # 추론 시간 측정
-            start_time = time.time()
+        # 적응형 Frame skip: 직전 프레임이 예산을 넘었는지 확인
+        # (end_frame()으로 화면 프레임 단위로 재는 중이면 거기서 확인)
+        if self.adaptive_skip and not self._frame_hook:
+            self._check_deadline()
+        
+        # 이벤트 기반: 의미 있는 변화가 있을 때만 추론 / Frame skip: N프레임마다 한 번만 추론
+        if self.inference_mode == 'event':
+            trigger = self._event_trigger(state)
+            run_inference = trigger is not None
+        else:
+            run_inference = self.frame_count >= self.next_inference_frame
+        
+        if run_inference:
+            if self._worker is not None:
+                # 백그라운드 스레드에 최신 상태만 넘기고 바로 진행 (기다리지 않음)
+                self._publish_state(state)
+            else:
+                # 추론 시간 측정
+                start_time = time.time()
+                self.last_action = self._infer_action(state)
+                
+                # 추론 시간 기록
+                inference_time = (time.time() - start_time) * 1000  # ms
+                self.inference_stats.record(inference_time)
+                self.total_inferences += 1
+                
+                if self.adaptive_skip and self.inference_mode != 'event':
+                    self._update_frame_skip(inference_time)
             
-            # 입력 데이터 준비
-            input_data = np.array([state], dtype=np.float32)
+            if self.inference_mode == 'event':
+                self.trigger_counts[trigger] += 1
+                self._last_obs[:] = state
+            self.next_inference_frame = self.frame_count + self.frame_skip
+        
+        if self._worker is not None:
+            # 가장 최근에 끝난 추론 결과 + 그 결과가 몇 프레임 전 상태로 계산됐는지
+            action, action_frame = self._completed
+            if action_frame:
+                self.last_action = action
+                staleness = self.frame_count - action_frame
+                self.staleness_sum += staleness
+                self.staleness_count += 1
+                self.max_staleness = max(self.max_staleness, staleness)
+        
+        # Skip된 프레임에서는 이전 행동 재사용
+        return self.last_action
+
+    def _infer_action(self, state):
+        """관측값 하나의 행동 선택 (정책 표 조회 또는 추론 후 Q값이 가장 큰 행동)"""
+        if self.table is not None:
+            return self.table.get_action(state)
+        
+        # 입력 데이터 준비 (env 버퍼를 그대로 입력으로 사용, 중간 배열 없음)
+        # 같은 버퍼를 가리키는 뷰일 때만 재사용 (float64/리스트처럼 복사된 입력은 매번 다시 변환)
+        if state is not self._state_source or not np.shares_memory(self._input_view, state):
+            self._state_source = state
+            self._input_view = np.asarray(state, dtype=np.float32).reshape(1, -1)
+        with self._predict_lock:
+            return int(self._predict(self._input_view)[0].argmax())
+
+    # ------------------------------------------------------------------
+    # 비동기 추론 (백그라운드 스레드)
+    # ------------------------------------------------------------------
+    def _start_worker(self):
+        """상태 버퍼 2개(게임 루프가 쓰는 쪽 / 스레드가 읽는 쪽)를 만들고 추론 스레드 시작"""
+        self._published = np.zeros(self.num_features, dtype=np.float32)  # 게임 루프가 최신 상태를 복사
+        self._working = np.zeros(self.num_features, dtype=np.float32)  # 스레드가 추론에 사용
+        self._published_frame = 0
+        self._has_new_state = False
+        self._stop_worker = False
+        self._condition = threading.Condition()
+        self._completed = (self.last_action, 0)  # (행동, 그 행동을 계산한 상태의 프레임 번호)
+        self._episode = 0  # reset_episode마다 증가 (이전 에피소드 상태로 계산한 결과는 버림)
+        
+        self.dropped_states = 0  # 스레드가 가져가기 전에 새 상태로 덮어쓴 횟수
+        self.staleness_sum = 0
+        self.staleness_count = 0
+        self.max_staleness = 0
+        
+        self._worker = threading.Thread(target=self._worker_loop, name='PongAgentInference', daemon=True)
+        self._worker.start()
+
+    def _publish_state(self, state):
+        """최신 상태를 게시용 버퍼에 복사 (스레드가 아직 이전 상태를 못 가져갔으면 버려짐)"""
+        with self._condition:
+            if self._has_new_state:
+                self.dropped_states += 1
+            self._published[:] = state
+            self._published_frame = self.frame_count
+            self._has_new_state = True
+            self._condition.notify()
+
+    def _worker_loop(self):
+        """게시된 최신 상태를 가져가서 추론하고 결과를 _completed에 기록"""
+        while True:
+            with self._condition:
+                while not self._has_new_state and not self._stop_worker:
+                    self._condition.wait()
+                if self._stop_worker:
+                    return
+                # 버퍼 교체 (복사 없이 읽는 쪽/쓰는 쪽을 바꿈)
+                self._published, self._working = self._working, self._published
+                frame = self._published_frame
+                episode = self._episode
+                self._has_new_state = False
             
-            # TFLite 추론
-            self.interpreter.set_tensor(
-                self.input_details[0]['index'], 
-                input_data
-            )
-            self.interpreter.invoke()
-            output = self.interpreter.get_tensor(
-                self.output_details[0]['index']
-            )
+            start_time = time.time()
+            action = self._infer_action(self._working)
+            inference_time = (time.time() - start_time) * 1000  # ms
             
-            # 행동 선택 (Q값이 가장 큰 행동)
-            self.last_action = np.argmax(output[0])
+            # 통계는 게임 루프(get_stats)가 읽는 중에 바뀌지 않도록 같은 락 안에서 기록
+            with self._condition:
+                if episode == self._episode:  # 추론 중에 에피소드가 바뀌었으면 결과를 버림
+                    self._completed = (action, frame)
+                self.inference_stats.record(inference_time)
+                self.total_inferences += 1
+
+    def close(self):
+        """백그라운드 추론 스레드 종료 (비동기 모드가 아니면 아무것도 안 함)"""
+        if self._worker is None:
+            return
+        with self._condition:
+            self._stop_worker = True
+            self._condition.notify()
+        self._worker.join()
+        self._worker = None
+
+    def _event_trigger(self, state):
+        """
+        마지막 추론 때의 관측값과 비교해서 다시 추론해야 하는 이유 반환 (필요 없으면 None)
+        
+        관측값 순서: [공x, 공y, 공2x, 공2y, 패들x, 공dx, 공dy, 공2dx, 공2dy, 공2활성]
+        """
+        last = self._last_obs
+        if last is None:
+            self._last_obs = np.array(state, dtype=np.float32)
+            return 'start'
+        
+        ball2_active = state[9] > 0.5
+        # 두 번째 공 등장
+        if ball2_active != (last[9] > 0.5):
+            return 'ball2'
+        # 공 세로 방향 전환 (패들/위쪽 벽에 맞음)
+        if (state[6] > 0) != (last[6] > 0) or (ball2_active and (state[8] > 0) != (last[8] > 0)):
+            return 'direction'
+        # 공이 아래 영역(패들 근처)으로 들어옴
+        lower = self.lower_region
+        if (state[1] >= lower > last[1]) or (ball2_active and state[3] >= lower > last[3]):
+            return 'lower_region'
+        # 관측값 변화량 (공이 아래 영역에서 내려오는 중이면 더 작은 변화에도 추론)
+        approaching = (state[1] >= lower and state[6] > 0) or (ball2_active and state[3] >= lower and state[8] > 0)
+        threshold = self.lower_delta_threshold if approaching else self.delta_threshold
+        if np.abs(state - last).max() > threshold:
+            return 'delta'
+        return None
+
+    def reset_episode(self):
+        """
+        에피소드 시작 시 호출
+        이전 행동/이벤트 기준 관측값을 지우고, 에피소드 사이 대기 시간을 데드라인 초과로 세지 않도록
+        프레임 간격 측정을 초기화 (다음 추론도 첫 에피소드처럼 frame_skip 프레임 뒤)
+        비동기 모드면 이전 에피소드의 게시 상태/추론 결과도 버림 (새 에피소드에 이전 행동이 섞이지 않도록)
+        """
+        self.last_action = 1
+        self._last_obs = None
+        self._last_frame_time = None
+        self.next_inference_frame = self.frame_count + self.frame_skip
+        if self._worker is not None:
+            with self._condition:
+                self._episode += 1
+                self._has_new_state = False
+                self._published_frame = 0
+                self._completed = (self.last_action, 0)
+
+    def end_frame(self, steps=1):
+        """
+        화면 프레임 하나를 마친 뒤 호출 (play_episodes)
+        FixedTimestep으로 화면 프레임마다 step을 몰아서 실행하면 get_action 호출 간격이
+        몰아서 짧았다가 화면 프레임마다 한 번 길어지므로, 호출 간격 대신 화면 프레임 시간을
+        이번 프레임에 실행한 step 수만큼의 예산과 비교
+        
+        Args:
+            steps: 이번 화면 프레임에 실행한 시뮬레이션 step 수
+        """
+        self._frame_hook = True
+        if self.adaptive_skip:
+            self._check_deadline(steps)
+
+    def _check_deadline(self, steps=1):
+        """
+        직전 확인부터 지금까지(= 한 프레임) 걸린 시간이 예산을 넘었는지 기록
+        
+        Args:
+            steps: 그동안 실행한 시뮬레이션 step 수 (예산 = frame_budget × steps)
+        """
+        now = time.perf_counter()
+        if self._last_frame_time is not None:
+            frame_time = (now - self._last_frame_time) * 1000  # ms
+            budget = self.frame_budget * max(steps, 1)
+            if frame_time > budget * (1 + self.deadline_slack):
+                self.missed_deadlines += 1
+                self._recent_misses += 1
+        self._last_frame_time = now
+
+    def _update_frame_skip(self, inference_time):
+        """
+        최근 추론 시간과 데드라인 초과 여부로 frame skip 간격 조절
+        
+        - 추론 시간을 간격으로 나눈 값이 프레임 예산의 inference_share 이하가 되는 최소 간격을 유지
+        - 지난 추론 이후 데드라인을 놓쳤으면 간격을 한 칸 넓힘
+        - narrow_after번 연속으로 놓치지 않았으면 한 칸 좁힘 (왔다 갔다 하지 않도록)
+        """
+        if self.latency_ema is None:
+            self.latency_ema = inference_time
+        else:
+            self.latency_ema += 0.1 * (inference_time - self.latency_ema)
+        required = math.ceil(self.latency_ema / (self.frame_budget * self.inference_share))
+        
+        new_skip = self.frame_skip
+        if self._recent_misses:
+            new_skip += 1
+            self._clean_windows = 0
+        else:
+            self._clean_windows += 1
+            if self._clean_windows >= self.narrow_after:
+                new_skip -= 1
+                self._clean_windows = 0
+        self._recent_misses = 0
+        
+        new_skip = min(max(new_skip, required, self.min_skip), self.max_skip)
+        if new_skip != self.frame_skip:
+            self.frame_skip = new_skip
+            self.skip_changes += 1
+
+    def _set_batch_size(self, batch_size):
+        """입력 배치 크기 변경 (크기가 바뀔 때만 TFLite resize + allocate_tensors)"""
+        if batch_size == self.batch_size:
+            return
+        if self.interpreter is not None:
+            self.interpreter.resize_tensor_input(self.input_index, [batch_size, self.num_features])
+            self.interpreter.allocate_tensors()
+        self.batch_size = batch_size
+
+    def _predict(self, inputs):
+        """
+        [B, N] 입력의 Q값 계산
+        
+        반환된 배열은 백엔드 내부 버퍼이므로 다음 추론 전에 버리거나 복사해야 함
+        """
+        if self.table is not None:
+            # 정책 표에는 Q값이 없으므로 고른 행동만 1인 one-hot을 대신 반환
+            return np.eye(3, dtype=np.float32)[self.table.get_actions(inputs)]
+        if self.qnet is not None:
+            return self.qnet.forward(inputs)
+        self._set_batch_size(inputs.shape[0])
+        self.interpreter.set_tensor(self.input_index, inputs)
+        self.interpreter.invoke()
+        return self.output_tensor()
+
+    def get_actions(self, states):
+        """
+        여러 상태를 한 번의 추론(invoke)으로 처리 (Frame skip 없이 모두 추론)
+        
+        Args:
+            states: numpy array [B, N] (B개의 상태)
+        
+        Returns:
+            actions: [B] 행동 배열
+            q_values: [B, 3] Q값 배열
+        """
+        states = np.asarray(states, dtype=np.float32)
+        batch_size = states.shape[0]
+        with self._predict_lock:
+            self._set_batch_size(batch_size)
             
-            # 추론 시간 기록
-            inference_time = (time.time() - start_time) * 1000  # ms
-            self.inference_times.append(inference_time)
-            self.total_inferences += 1
+            # 추론 시간 측정 (배치 크기가 바뀔 때의 resize 비용은 제외)
+            start_time = time.time()
+            q_values = self._predict(states).copy()
+            actions = q_values.argmax(axis=1)
+            batch_time = (time.time() - start_time) * 1000  # ms
         
-        # Skip된 프레임에서는 이전 행동 재사용
-        return self.last_action
+        # 배치 통계 기록 (배치 전체 시간 + 샘플당 분할 시간)
+        self.total_batches += 1
+        self.total_batch_samples += batch_size
+        self.total_batch_time += batch_time
+        self.last_batch_stats = {
+            'batch_size': batch_size,
+            'batch_time': batch_time,
+            'per_sample_time': batch_time / batch_size,
+        }
+        
+        return actions, q_values
     
     def get_stats(self):
         """성능 통계 반환"""
-        if not self.inference_times:
+        if self._worker is not None:
+            # 백그라운드 스레드가 통계를 기록하는 중에 읽지 않도록
+            with self._condition:
+                return self._collect_stats()
+        return self._collect_stats()
+
+    def _collect_stats(self):
+        """get_stats 내용 (통계 딕셔너리 만들기)"""
+        if not self.inference_stats.count and not self.total_batches:
             return None
         
-        return {
-            'avg_inference_time': np.mean(self.inference_times),
-            'max_inference_time': np.max(self.inference_times),
-            'min_inference_time': np.min(self.inference_times),
+        stats = {
             'total_inferences': self.total_inferences,
             'total_frames': self.frame_count
         }
+        if self.inference_stats.count:
+            summary = self.inference_stats.summary()
+            stats['avg_inference_time'] = summary['mean']
+            stats['max_inference_time'] = summary['max']
+            stats['min_inference_time'] = summary['min']
+            stats['p50_inference_time'] = summary['p50']
+            stats['p90_inference_time'] = summary['p90']
+            stats['p99_inference_time'] = summary['p99']
+            # 최근 stats_window초 (없으면 None)
+            stats['recent_inference'] = self.inference_stats.window_summary(self.stats_window)
+        if self.adaptive_skip:
+            stats['frame_skip'] = self.frame_skip
+            stats['skip_changes'] = self.skip_changes
+            stats['missed_deadlines'] = self.missed_deadlines
+        if self.inference_mode == 'event':
+            stats['trigger_counts'] = dict(self.trigger_counts)
+        if self.async_inference:
+            stats['dropped_states'] = self.dropped_states
+            stats['avg_staleness'] = self.staleness_sum / self.staleness_count if self.staleness_count else 0.0
+            stats['max_staleness'] = self.max_staleness
+        if self.total_batches:
+            stats['total_batches'] = self.total_batches
+            stats['avg_batch_time'] = self.total_batch_time / self.total_batches
+            stats['avg_per_sample_time'] = self.total_batch_time / self.total_batch_samples
+        return stats
 
 
 def print_header():
@@ -142,28 +592,237 @@ def print_final_stats(total_score, total_frames, total_time, episodes, agent):
     
     # AI 성능 통계
     stats = agent.get_stats()
-    if stats:
+    if stats and stats['total_inferences']:
         skip_ratio = (stats['total_frames'] - stats['total_inferences']) / stats['total_frames'] * 100
         print(f"\n  AI 성능")
         print(f"{'─'*60}")
         print(f"   평균 추론 시간:  {stats['avg_inference_time']:.2f} ms")
         print(f"   최대 추론 시간:  {stats['max_inference_time']:.2f} ms")
         print(f"   최소 추론 시간:  {stats['min_inference_time']:.2f} ms")
+        print(f"   추론 p50/p90/p99: {stats['p50_inference_time']:.3f} / {stats['p90_inference_time']:.3f}"
+              f" / {stats['p99_inference_time']:.3f} ms")
+        recent = stats['recent_inference']
+        if recent:
+            print(f"   최근 {agent.stats_window:.0f}초 p50/p99: {recent['p50']:.3f} / {recent['p99']:.3f} ms"
+                  f" ({recent['count']}회)")
         print(f"   총 추론 횟수:    {stats['total_inferences']}회")
         print(f"   Frame Skip 비율: {skip_ratio:.1f}%")
+        if 'trigger_counts' in stats:
+            triggers = ", ".join(f"{name} {count}" for name, count in stats['trigger_counts'].items())
+            print(f"   추론 이유:       {triggers}")
+        if 'dropped_states' in stats:
+            print(f"   행동 지연:       평균 {stats['avg_staleness']:.2f} / 최대 {stats['max_staleness']}프레임")
+            print(f"   버려진 상태:     {stats['dropped_states']}회")
+        if 'skip_changes' in stats:
+            print(f"   최종 Frame Skip: {stats['frame_skip']}")
+            print(f"   간격 변경 횟수:  {stats['skip_changes']}회")
+            print(f"   데드라인 초과:   {stats['missed_deadlines']}프레임")
     
     print("="*60 + "\n")
 
 
-def main():
+def print_startup_profile(startup_times):
+    """시작 시간(첫 프레임까지) 구간별 출력"""
+    labels = [
+        ('import', '기본 모듈 import'),
+        ('backend_import', '추론 백엔드 import'),
+        ('model_load', '모델 로드'),
+        ('allocate_tensors', 'allocate_tensors'),
+        ('pygame_init', 'pygame 초기화'),
+        ('first_frame', '첫 프레임'),
+    ]
+    print(f"\n{'─'*60}")
+    print(" 시작 시간 분석 (--profile-startup)")
+    print(f"{'─'*60}")
+    for key, label in labels:
+        if key in startup_times:
+            print(f"   {label:<20} {startup_times[key]:>9.1f} ms")
+    print(f"   {'첫 프레임까지 전체':<20} {startup_times['total']:>9.1f} ms")
+    print(f"{'─'*60}")
+
+
+def report_frame_trace(trace, path):
+    """프레임 구간별 시간 표 출력 + 기록 파일 저장 (--trace-frames)"""
+    if trace is None:
+        return
+    trace.print_summary()
+    trace.dump(path)
+    print(f" 프레임 기록 저장: {path}")
+
+
+def play_episodes(agent, env, max_episodes, render_mode=None, timestep=None, trace=None,
+                  seed=None, max_frames=None, on_first_frame=None):
+    """
+    에피소드를 반복하는 게임 루프 (main과 benchmark.py 전체 프레임 측정이 같이 사용)
+    
+    Args:
+        agent: PongAgent
+        env: PongEnv (또는 VideoRecorder로 감싼 env)
+        max_episodes: 진행할 에피소드 수
+        render_mode: 'human'이면 이벤트 처리(ESC/창 닫기) + 화면 그리기
+        timestep: FixedTimestep (화면을 시뮬레이션보다 느리게 그릴 때, None이면 프레임당 1 step)
+        trace: FrameTrace (None이면 기록 안 함)
+        seed: 첫 에피소드 reset 시드 (같은 시드면 같은 게임)
+        max_frames: 전체 step 수 제한 (None이면 에피소드가 끝날 때까지)
+        on_first_frame: 첫 프레임을 마친 뒤 한 번 호출할 함수
+    
+    반환값:
+    {'total_score', 'total_frames', 'total_time', 'episodes', 'scores'} (창을 닫거나 ESC를 누르면 None)
+    """
+    if render_mode == 'human':
+        import pygame  # 프레임 루프 밖에서 한 번만 import
+    
+    # 게임 통계 변수
+    total_score = 0
+    total_frames = 0
+    total_time = 0
+    all_scores = []
+    
+    for episode in range(1, max_episodes + 1):
+        print_episode_start(episode, max_episodes)
+        
+        # 에피소드 초기화
+        state = env.reset(seed=seed if episode == 1 else None)
+        done = False
+        episode_score = 0
+        episode_frames = 0
+        episode_start_time = time.time()
+        agent.reset_episode()
+        if timestep is not None:
+            timestep.reset()
+        
+        # 에피소드 실행
+        while not done:
+            if trace is not None:
+                trace.start_frame()
+            
+            # Pygame 이벤트 처리 (ESC로 종료)
+            if render_mode == 'human':
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        print("\n  창을 닫았습니다. 프로그램을 종료합니다.")
+                        return None
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            print("\n  ESC 키를 눌렀습니다. 프로그램을 종료합니다.")
+                            return None
+            
+            if trace is not None:
+                trace.mark(FrameTrace.EVENTS)
+            
+            # 이번 프레임에 실행할 시뮬레이션 step 수
+            steps = timestep.advance() if timestep is not None else 1
+            steps_done = 0
+            for _ in range(steps):
+                if timestep is not None:
+                    env.save_positions()  # 보간 렌더링용
+                
+                # AI가 행동 선택 (Frame skip 자동 적용)
+                action = agent.get_action(state)
+                if trace is not None:
+                    trace.mark(FrameTrace.INFERENCE)
+                
+                # 환경에서 행동 실행
+                state, reward, done, info = env.step(action)
+                if trace is not None:
+                    trace.mark(FrameTrace.STEP)
+                episode_score = info['score']
+                episode_frames += 1
+                steps_done += 1
+                if done:
+                    break
+            
+            # 렌더링
+            if render_mode == 'human':
+                env.render(frame_trace=trace, alpha=timestep.alpha if timestep is not None else None)
+            
+            # 적응형 Frame skip 데드라인은 화면 프레임 단위로 확인
+            agent.end_frame(steps_done)
+            
+            if on_first_frame is not None:
+                on_first_frame()
+                on_first_frame = None
+            
+            if max_frames is not None and total_frames + episode_frames >= max_frames:
+                break
+        
+        # 에피소드 종료
+        episode_time = time.time() - episode_start_time
+        print_episode_end(episode_score, episode_frames, episode_time)
+        
+        # 통계 업데이트
+        total_score += episode_score
+        total_frames += episode_frames
+        total_time += episode_time
+        all_scores.append(episode_score)
+        
+        if max_frames is not None and total_frames >= max_frames:
+            break
+    
+    return {
+        'total_score': total_score,
+        'total_frames': total_frames,
+        'total_time': total_time,
+        'episodes': len(all_scores),
+        'scores': all_scores,
+    }
+
+
+def parse_args(argv=None):
+    """명령행 옵션"""
+    parser = argparse.ArgumentParser(description="Pong AI 게임 (Frame Skip + TFLite)")
+    parser.add_argument('--backend', choices=['auto', 'tflite', 'numpy', 'table'], default='auto',
+                        help="추론 백엔드 (기본값: auto = tflite_runtime → tensorflow → numpy, "
+                             "table = policy_table.py로 만든 정책 표, --table로 경로 지정)")
+    parser.add_argument('--table', default=None, metavar='PATH',
+                        help="--backend table에서 쓸 정책 표 .npz "
+                             "(python policy_table.py --output PATH로 생성)")
+    parser.add_argument('--inference-mode', choices=['skip', 'event'], default='skip',
+                        help="skip = N프레임마다 추론, event = 상태 변화가 있을 때만 추론")
+    parser.add_argument('--async-inference', action='store_true',
+                        help="백그라운드 스레드에서 추론 (게임 루프가 invoke를 기다리지 않음)")
+    parser.add_argument('--adaptive-skip', action='store_true',
+                        help="추론 시간에 맞춰 frame skip 자동 조절 (1~8)")
+    parser.add_argument('--trace-frames', nargs='?', const='frame_trace.csv', default=None, metavar='PATH',
+                        help="프레임 구간별(이벤트/추론/step/그리기/flip/tick) 시간 기록 "
+                             "(.csv 또는 .npy, 기본값: frame_trace.csv)")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="화면 전체 대신 바뀐 영역(패들/공/점수)만 다시 그림")
+    parser.add_argument('--render-fps', type=int, default=None,
+                        help="화면 그리기 FPS (시뮬레이션 틱보다 낮으면 실제 시간만큼 step을 몰아서 실행하고 "
+                             "위치를 보간해서 그림, 예: 라즈베리파이에서 30)")
+    parser.add_argument('--headless', action='store_true',
+                        help="화면 없이 최대 속도로 실행 (실시간보다 빠르게 평가)")
+    parser.add_argument('--record', default=None, metavar='PATH',
+                        help="평가 에피소드를 창 없이 진행하면서 GIF/동영상으로 저장 "
+                             "(.gif/.mp4, '{episode}'가 있으면 에피소드마다 따로 저장)")
+    parser.add_argument('--record-every', type=int, default=4,
+                        help="녹화할 때 몇 step마다 한 프레임을 저장할지 (기본값: 4 → 30 FPS 영상)")
+    parser.add_argument('--record-scale', type=int, default=2,
+                        help="녹화 화면을 가로/세로 몇 분의 1로 줄일지 (기본값: 2)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="import/모델 로드/allocate_tensors/pygame 초기화/첫 프레임 시간 출력")
+    args = parser.parse_args(argv)
+    if args.backend == 'table' and args.table is None:
+        parser.error("--backend table은 --table PATH가 필요합니다 (python policy_table.py --output PATH로 생성)")
+    return args
+
+
+def main(argv=None):
     """메인 게임 루프"""
+    args = parse_args(argv)
     
     # 설정
     MODEL_PATH = 'pong_model.tflite'
+    if args.backend == 'table':
+        MODEL_PATH = args.table  # python policy_table.py --output PATH로 생성
     FRAME_SKIP = 4  # 2~8 사이에서 조절 가능
     MAX_EPISODES = 5  # 랩탑 테스트는 적게
-    RENDER_MODE = 'human'  # 랩탑에서는 화면 보면서 테스트!
-    Target_FPS = 120  # 목표 FPS 설정 (환경에 따라 다름)
+    RENDER_MODE = None if args.headless else 'human'  # 랩탑에서는 화면 보면서 테스트!
+    if args.record:
+        RENDER_MODE = 'rgb_array'  # 녹화는 창 없이 화면 밖에서 그림
+    Target_FPS = 120  # 목표 FPS 설정 (환경에 따라 다름) = 시뮬레이션 틱
+    RENDER_FPS = args.render_fps or Target_FPS
 
     # 헤더 출력
     print_header()
@@ -171,81 +830,76 @@ def main():
     print(f" 모델 파일: {MODEL_PATH}")
     print(f" Frame Skip: {FRAME_SKIP}")
     print(f"에피소드 수: {MAX_EPISODES}")
-    print(f" 렌더링 모드: {'활성화' if RENDER_MODE == 'human' else '비활성화'}")
+    print(f" 렌더링 모드: {'활성화' if RENDER_MODE == 'human' else '비활성화 (최대 속도)'}")
+    if args.record:
+        print(f" 녹화: {args.record} ({args.record_every} step마다 1프레임, 1/{args.record_scale} 크기)")
+    if RENDER_MODE == 'human' and RENDER_FPS != Target_FPS:
+        print(f" 시뮬레이션 {Target_FPS} step/s, 화면 {RENDER_FPS} FPS (보간)")
     
     try:
         # 1. AI 에이전트 초기화
         agent = PongAgent(
             model_path=MODEL_PATH,
-            frame_skip=FRAME_SKIP
+            frame_skip=FRAME_SKIP,
+            backend=args.backend,
+            adaptive_skip=args.adaptive_skip,
+            target_fps=Target_FPS,
+            inference_mode=args.inference_mode,
+            async_inference=args.async_inference
         )
+        startup_times = {'import': _IMPORT_TIME}
+        startup_times.update(agent.startup_times)
         
         # 2. 게임 환경 초기화
         print(f"\n 게임 환경 초기화 중...")
-        env = PongEnv(render_mode=RENDER_MODE, target_fps=Target_FPS)
+        start_time = time.perf_counter()
+        env = PongEnv(render_mode=RENDER_MODE, target_fps=Target_FPS, dirty_rects=args.dirty_rects,
+                      render_fps=RENDER_FPS)
+        if args.record:
+            # 평가 에피소드를 진행하면서 프레임을 바로 인코더로 보냄
+            env = VideoRecorder(env, args.record, fps=Target_FPS // args.record_every,
+                                every=args.record_every, downscale=args.record_scale)
+        startup_times['pygame_init'] = (time.perf_counter() - start_time) * 1000
+        first_frame_start = time.perf_counter()
         print(f" 게임 환경 로드 완료")
         print(f"\n 팁: ESC 키를 눌러 언제든 종료할 수 있습니다.")
         
-        # 3. 게임 통계 변수
-        total_score = 0
-        total_frames = 0
-        total_time = 0
-        all_scores = []
+        # 프레임 구간별 시간 기록 (--trace-frames, 끄면 None)
+        trace = FrameTrace() if args.trace_frames else None
         
-        # 4. 게임 루프
-        for episode in range(1, MAX_EPISODES + 1):
-            print_episode_start(episode, MAX_EPISODES)
-            
-            # 에피소드 초기화
-            state = env.reset()
-            done = False
-            episode_score = 0
-            episode_frames = 0
-            episode_start_time = time.time()
-            
-            # 에피소드 실행
-            while not done:
-                # Pygame 이벤트 처리 (ESC로 종료)
-                if RENDER_MODE == 'human':
-                    import pygame
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            print("\n  창을 닫았습니다. 프로그램을 종료합니다.")
-                            env.close()
-                            return 0
-                        if event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_ESCAPE:
-                                print("\n  ESC 키를 눌렀습니다. 프로그램을 종료합니다.")
-                                env.close()
-                                return 0
-                
-                # AI가 행동 선택 (Frame skip 자동 적용)
-                action = agent.get_action(state)
-                
-                # 환경에서 행동 실행
-                state, reward, done, info = env.step(action)
-                episode_score = info['score']
-                episode_frames += 1
-                
-                # 렌더링
-                if RENDER_MODE == 'human':
-                    env.render()
-            
-            # 에피소드 종료
-            episode_time = time.time() - episode_start_time
-            print_episode_end(episode_score, episode_frames, episode_time)
-            
-            # 통계 업데이트
-            total_score += episode_score
-            total_frames += episode_frames
-            total_time += episode_time
-            all_scores.append(episode_score)
+        # 화면을 시뮬레이션보다 느리게 그리면 프레임마다 흐른 시간만큼 step 실행 (아니면 프레임당 1 step)
+        timestep = None
+        if RENDER_MODE == 'human' and RENDER_FPS < Target_FPS:
+            timestep = FixedTimestep(sim_fps=Target_FPS)
+        
+        # 3. 게임 루프
+        def on_first_frame():
+            # 첫 프레임까지 걸린 시간
+            now = time.perf_counter()
+            startup_times['first_frame'] = (now - first_frame_start) * 1000
+            startup_times['total'] = (now - _START_TIME) * 1000
+            if args.profile_startup:
+                print_startup_profile(startup_times)
+        
+        result = play_episodes(agent, env, MAX_EPISODES, render_mode=RENDER_MODE, timestep=timestep,
+                               trace=trace, on_first_frame=on_first_frame)
+        if result is None:
+            # 창을 닫거나 ESC를 누름
+            report_frame_trace(trace, args.trace_frames)
+            agent.close()
+            env.close()
+            return 0
         
-        # 5. 최종 통계 출력
-        print_final_stats(total_score, total_frames, total_time, MAX_EPISODES, agent)
+        # 4. 최종 통계 출력
+        print_final_stats(result['total_score'], result['total_frames'], result['total_time'],
+                          result['episodes'], agent)
+        report_frame_trace(trace, args.trace_frames)
         
-        # 6. 환경 종료
+        # 5. 환경 종료
+        agent.close()
         env.close()
+        if args.record:
+            print(f" 녹화 저장: {', '.join(env.saved_paths)} ({env.frames_written}프레임)")
         
         print(" 테스트 완료. 라즈베리파이에 배포할 준비가 되었습니다.")
         
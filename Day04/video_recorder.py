@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+env를 감싸서 진행하는 동안 프레임을 바로 인코더(ffmpeg)로 보내는 GIF/동영상 녹화기
+프레임을 리스트에 모았다가 imageio.mimsave로 한 번에 저장하지 않으므로
+에피소드가 길어져도 메모리 사용량이 일정함
+
+필요 패키지: pip install imageio-ffmpeg
+
+사용 예:
+    env = VideoRecorder(PongEnv(render_mode='rgb_array'), 'pong.mp4', every=4, downscale=2)
+    state = env.reset()
+    ...평가 루프 그대로 env.step(action)...
+    env.close()  # 파일 마무리
+
+    # gymnasium env도 가능 (render_mode='rgb_array'로 만든 것)
+    env = VideoRecorder(gym.make('CartPole-v1', render_mode='rgb_array'), 'cartpole_{episode}.gif')
+"""
+
+import numpy as np
+
+
+class VideoRecorder:
+    """reset/step 후 env.render() 프레임을 바로 인코더에 쓰는 래퍼"""
+
+    def __init__(self, env, path, fps=30, every=1, downscale=1, episodes=None):
+        """
+        Args:
+            env: render()가 [세로, 가로, 3] uint8 이미지를 반환하는 env (render_mode='rgb_array')
+            path: 저장 경로 (.gif, .mp4 등), '{episode}'가 있으면 에피소드마다 따로 저장
+            fps: 저장할 영상의 FPS
+            every: 몇 스텝마다 한 프레임을 저장할지 (프레임 솎아내기)
+            downscale: 가로/세로를 몇 분의 1로 줄일지 (정수, 픽셀 건너뛰기)
+            episodes: 녹화할 에피소드 번호들 (1부터, None이면 전부)
+        """
+        self.env = env
+        self.path = path
+        self.fps = fps
+        self.every = every
+        self.downscale = downscale
+        self.episodes = set(episodes) if episodes is not None else None
+
+        self.episode = 0
+        self.frames_written = 0
+        self.saved_paths = []
+        self._recording = False
+        self._step = 0
+        self._writer = None
+        self._writer_path = None
+        self._frame = None  # 줄인 프레임을 담을 버퍼 (크기가 정해지면 한 번만 만듦)
+
+    def __getattr__(self, name):
+        # 녹화기에 없는 속성(score, action_space_n 등)은 감싼 env에서 찾음
+        return getattr(self.env, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reset(self, *args, **kwargs):
+        """env.reset() 후 새 에피소드 녹화 시작 (첫 프레임 저장)"""
+        result = self.env.reset(*args, **kwargs)
+        if '{episode}' in self.path:
+            self._finish()  # 에피소드마다 파일을 나누면 이전 파일 마무리
+        self.episode += 1
+        self._recording = self.episodes is None or self.episode in self.episodes
+        self._step = 0
+        if self._recording:
+            self._write_frame()
+        return result
+
+    def step(self, action):
+        """
+        env.step() 후 every 스텝마다 프레임 저장 (결과는 env.step 그대로 반환)
+        에피소드가 끝난 프레임은 every와 상관없이 항상 저장 (영상이 끝 장면까지 나오도록)
+        """
+        result = self.env.step(action)
+        self._step += 1
+        # (state, reward, done, info) 또는 gymnasium의 (obs, reward, terminated, truncated, info)
+        done = result[2] or (len(result) == 5 and result[3])
+        if self._recording and (self._step % self.every == 0 or done):
+            self._write_frame()
+        return result
+
+    def _write_frame(self):
+        """현재 화면을 인코더로 보냄"""
+        frame = self.env.render()
+        if frame is None:
+            return
+        if self.downscale > 1:
+            frame = frame[::self.downscale, ::self.downscale]
+        if self._frame is None or self._frame.shape != frame.shape:
+            self._frame = np.empty(frame.shape, dtype=np.uint8)
+        np.copyto(self._frame, frame)  # 인코더에 넘길 연속 메모리 버퍼 (매 프레임 재사용)
+
+        if self._writer is None:
+            self._open(self._frame.shape)
+        self._writer.send(self._frame)
+        self.frames_written += 1
+
+    def _open(self, shape):
+        """첫 프레임 크기로 ffmpeg 인코더 열기"""
+        try:
+            import imageio_ffmpeg
+        except ImportError:
+            raise ImportError("녹화하려면 imageio-ffmpeg가 필요합니다: pip install imageio-ffmpeg")
+
+        path = self.path.format(episode=self.episode)
+        height, width = shape[:2]
+        if path.lower().endswith('.gif'):
+            options = dict(codec='gif', pix_fmt_out='rgb8', macro_block_size=1, output_params=['-loop', '0'])
+        else:
+            # yuv420p는 가로/세로가 짝수여야 해서 홀수면 ffmpeg가 짝수 크기로 맞춤
+            options = dict(codec='libx264', pix_fmt_out='yuv420p', macro_block_size=2)
+        self._writer = imageio_ffmpeg.write_frames(path, (width, height), fps=self.fps, **options)
+        self._writer.send(None)  # 인코더 시작
+        self._writer_path = path
+
+    def _finish(self):
+        """열려 있는 파일 마무리"""
+        if self._writer is not None:
+            self._writer.close()
+            self.saved_paths.append(self._writer_path)
+            self._writer = None
+            self._writer_path = None
+
+    def close(self):
+        """파일 마무리 + env 종료"""
+        self._finish()
+        self.env.close()
@@ -1,12 +1,20 @@
+import math
+
 import numpy as np
 
 class PongEnv:
-    def __init__(self, render_mode=None, target_fps = 60):
+    def __init__(self, render_mode=None, target_fps=120, dirty_rects=False, render_fps=None,
+                 render_size=None):
         """
         환경 초기화
         
         Args:
-            render_mode: 'human'이면 화면 렌더링, None이면 헤드리스 모드
+            render_mode: 'human'이면 화면 렌더링, 'rgb_array'면 창 없이 그린 이미지를 render()가 반환,
+                         None이면 헤드리스 모드
+            target_fps: 시뮬레이션 틱 (게임 시간 1초당 step 수, 두 번째 공 등장 타이머 기준)
+            render_fps: render()의 clock.tick 속도 (None이면 target_fps와 같음)
+            render_size: rgb_array 이미지 크기 (가로, 세로), None이면 게임 화면 크기 그대로
+            dirty_rects: True면 화면 전체 대신 바뀐 영역(패들/공/점수)만 지우고 다시 그림
         """
         self.width = 800
         self.height = 600
@@ -30,14 +38,14 @@ class PongEnv:
         
         # 렌더링 설정
         self.render_mode = render_mode
-        self.target_fps = 120  # FPS 증가 (기존 60)
+        self.target_fps = target_fps  # 시뮬레이션 틱 (기본값 120, 기존 60)
+        self.render_fps = render_fps if render_fps is not None else target_fps
 
         # 공과 패들 속도 설정
         self.ball_speed_min = 0.025 # 시작 속도
         self.ball_speed_max = 0.3  # 최대 속도
         self.paddle_speed_min = 0.0125
         self.paddle_speed_max = 0.05
-        self.target_fps = 120
 
         # 두 번째 공 상태 변수
         self.ball2_x = None
@@ -54,12 +62,43 @@ class PongEnv:
         #self.red_ball_interval = 5  # 5점 간격 등장
         #self.red_ball_start_score = 15
 
+        # 관측값 버퍼 (reset/step마다 새로 만들지 않고 제자리에서 채움)
+        self.state_buffer = np.zeros(10, dtype=np.float32)
+
+        # 환경 전용 난수 생성기 (reset(seed=...)로 고정)
+        # 난수는 블록 단위로 미리 뽑아 두고 step에서는 인덱스로 꺼내 쓰기만 함
+        self.np_random = None
+        self.random_block_size = 4096
+        self._signs = []
+        self._sign_index = 0
+        self._uniforms = []
+        self._uniform_index = 0
+
         # 화면 렌더링 변수
         self.screen = None
         self.clock = None
         self.font = None
         self.small_font = None
         
+        # rgb_array 출력 이미지 Surface와 그 픽셀 배열 뷰 (한 번만 만들고 매 프레임 같은 메모리에 그림)
+        self.render_size = tuple(render_size) if render_size is not None else (self.width, self.height)
+        self._frame = None
+        self._frame_array = None
+        
+        # 부분 렌더링 (dirty_rects=True): 이전 프레임에 그린 영역 + 점수 글자 캐시
+        self.dirty_rects = dirty_rects
+        self._prev_rects = []
+        self._full_redraw = True  # 다음 render에서 화면 전체를 다시 그릴지
+        self._score_text_value = None
+        self._score_text_surface = None
+        
+        # 게임 오버 화면 (오버레이/폰트/글자를 처음 한 번만 만들어 둠)
+        self._game_over = None
+        self._button_hover = None
+        
+        # 보간 렌더링용 직전 step의 위치 (save_positions()로 저장)
+        self._prev_positions = None
+        
         if render_mode == 'human':
             try:
                 import pygame
@@ -72,13 +111,71 @@ class PongEnv:
             except ImportError:
                 print("pygame이 설치되지 않았습니다. headless mode로 실행하거나 pygame을 설치하세요.")
                 self.render_mode = None
+        elif render_mode == 'rgb_array':
+            try:
+                import os
+                import pygame
+                os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # 창(디스플레이) 없이 실행
+                pygame.init()
+                self.font = pygame.font.Font(None, 74)
+                self.small_font = pygame.font.Font(None, 48)
+                # 미리 만든 NumPy 버퍼 위에 Surface를 만들어서 그 메모리에 바로 그림
+                # (surfarray.pixels3d 뷰는 Surface를 잠가서 점수 글자 blit이 안 됨)
+                self.screen, screen_array = self._buffer_surface((self.width, self.height))
+                if self.render_size == (self.width, self.height):
+                    self._frame, self._frame_array = self.screen, screen_array
+                else:
+                    # 크기가 다르면 transform.scale로 출력 Surface에 확대/축소 (역시 미리 만든 버퍼)
+                    self._frame, self._frame_array = self._buffer_surface(self.render_size)
+            except ImportError:
+                print("pygame이 설치되지 않았습니다. headless mode로 실행하거나 pygame을 설치하세요.")
+                self.render_mode = None
+
+    def seed(self, seed=None):
+        """
+        환경 전용 난수 생성기 설정
+
+        Args:
+            seed: 정수 또는 np.random.SeedSequence (None이면 OS 엔트로피 사용)
+        """
+        self.np_random = np.random.default_rng(seed)
+        self._signs = []
+        self._sign_index = 0
+        self._uniforms = []
+        self._uniform_index = 0
+
+    def _random_sign(self):
+        """미리 뽑아 둔 블록에서 -1.0 또는 1.0 하나 꺼내기"""
+        if self._sign_index == len(self._signs):
+            self._signs = self.np_random.choice([-1.0, 1.0], size=self.random_block_size).tolist()
+            self._sign_index = 0
+        sign = self._signs[self._sign_index]
+        self._sign_index += 1
+        return sign
+
+    def _random_uniform(self):
+        """미리 뽑아 둔 블록에서 [0, 1) 난수 하나 꺼내기"""
+        if self._uniform_index == len(self._uniforms):
+            self._uniforms = self.np_random.random(self.random_block_size).tolist()
+            self._uniform_index = 0
+        value = self._uniforms[self._uniform_index]
+        self._uniform_index += 1
+        return value
+
+    def reset(self, seed=None):
+        """
+        환경을 초기 상태로 리셋
+
+        Args:
+            seed: 주면 난수 생성기를 다시 설정 (같은 seed면 같은 게임 진행)
+        """
+        if seed is not None or self.np_random is None:
+            self.seed(seed)
 
-    def reset(self):
-        """환경을 초기 상태로 리셋"""
         self.ball_x = 0.5  # 화면 중앙
         self.ball_y = 0.1  # 화면 상단
         self.paddle_x = 0.5  # 패들 중앙
-        self.ball_dx = np.random.choice([-self.ball_speed_min, self.ball_speed_min])  # 좌우 랜덤
+        self.ball_dx = self._random_sign() * self.ball_speed_min  # 좌우 랜덤
         self.ball_dy = self.ball_speed_min  # 아래로 이동
         self.current_ball_speed = self.ball_speed_min
         self.current_paddle_speed = self.paddle_speed_min
@@ -86,7 +183,7 @@ class PongEnv:
         # 두 번째 공 초기화 (딜레이 적용)
         self.ball2_x = 0.5
         self.ball2_y = 0.2
-        self.ball2_dx = np.random.choice([-self.ball_speed_min, self.ball_speed_min])
+        self.ball2_dx = self._random_sign() * self.ball_speed_min
         self.ball2_dy = self.ball_speed_min
         self.ball2_active = False
         self.ball2_timer = 0.0
@@ -98,18 +195,22 @@ class PongEnv:
 
         # 빨간 공 초기화
         self.red_balls = []
+        
+        self._prev_positions = None
 
         return self._get_state()
 
-    def step(self, action):
+    def step(self, action, out=None):
         """
         action:
         0 = 왼쪽으로 이동
         1 = 정지
         2 = 오른쪽으로 이동
 
+        out: 관측값을 채워 넣을 float32 배열 (None이면 환경의 state_buffer 사용)
+
         반환값:
-        state : 현재 상태
+        state : 현재 상태 (out 또는 state_buffer, 다음 step에서 덮어쓰이므로 보관하려면 .copy())
         reward : 보상
         done : 에피소드 종료 여부
         info : 추가 정보 (딕셔너리)
@@ -166,12 +267,12 @@ class PongEnv:
             if abs(self.ball_x - self.paddle_x) <= self.paddle_width / 2:
                 self.ball_dy *= -1
                 # x방향 랜덤화
-                self.ball_dx = np.random.choice([-1, 1]) * abs(self.ball_dx)
+                self.ball_dx = self._random_sign() * abs(self.ball_dx)
                 self.score += 1
                 reward += 1.0
                 # 10000점 초과 시 0.001% 확률로 즉시 게임오버
                 if self.score > 10000:
-                    if np.random.rand() < 0.000001:
+                    if self._random_uniform() < 0.000001:
                         done = True
             else:
                 self.misses += 1
@@ -182,12 +283,12 @@ class PongEnv:
             if abs(self.ball2_x - self.paddle_x) <= self.paddle_width / 2:
                 self.ball2_dy *= -1
                 # x방향 랜덤화
-                self.ball2_dx = np.random.choice([-1, 1]) * abs(self.ball2_dx)
+                self.ball2_dx = self._random_sign() * abs(self.ball2_dx)
                 self.score += 1
                 reward += 1.0
                 # 10000점 초과 시 0.001% 확률로 즉시 게임오버
                 if self.score > 10000:
-                    if np.random.rand() < 0.000001:
+                    if self._random_uniform() < 0.000001:
                         done = True
             else:
                 self.misses += 1
@@ -203,9 +304,9 @@ class PongEnv:
             'score': self.score,
         }
 
-        return self._get_state(), reward, done, info
+        return self._get_state(out), reward, done, info
 
-    def _get_state(self):
+    def _get_state(self, out=None):
         """
         AI에게 줄 입력값(관측값) 추출
         현재 상태를 numpy 배열로 반환
@@ -217,74 +318,271 @@ class PongEnv:
         - self.ball_dx: 공의 x 방향 속도
         - self.ball_dy: 공의 y 방향 속도
         
-        hint: np.array([값1, 값2, ...], dtype=np.float32)
+        매 프레임 새 배열을 만들지 않도록 out(기본값: self.state_buffer)에 제자리로 채운다.
         """
-        return np.array([
-             self.ball_x,
-             self.ball_y,
-             self.ball2_x,
-             self.ball2_y,
-             self.paddle_x,
-             self.ball_dx,
-             self.ball_dy,
-             self.ball2_dx,
-             self.ball2_dy,
-             float(self.ball2_active),
-             ], dtype= np.float32)
+        state = self.state_buffer if out is None else out
+        state[0] = self.ball_x
+        state[1] = self.ball_y
+        state[2] = self.ball2_x
+        state[3] = self.ball2_y
+        state[4] = self.paddle_x
+        state[5] = self.ball_dx
+        state[6] = self.ball_dy
+        state[7] = self.ball2_dx
+        state[8] = self.ball2_dy
+        state[9] = self.ball2_active
+        return state
 
+    def advance_until_event(self, action, max_frames=None):
+        """
+        action을 유지한 채 다음 이벤트가 일어나는 프레임까지 한 번에 진행 (헤드리스 전용)
 
-    # 화면 렌더링 관련 함수
-    def render(self):
+        이벤트 사이에는 공이 일정한 속도로 직선 운동하므로, 다음 이벤트
+        (벽 충돌, 패들 라인 도달, 두 번째 공 등장)까지 남은 프레임 수를
+        식으로 계산하고, 그 직전까지는 위치를 np.add.accumulate 한 번으로 구해서 건너뛴다.
+        공 위치가 0.025 격자에 있어서 경계(0.95, 벽)에 딱 걸치는 일이 잦으므로
+        식으로 구한 프레임 수는 어림값으로만 쓰고, 그 2프레임 전까지만 건너뛴 뒤
+        이벤트가 실제로 일어날 때까지 step을 부른다. accumulate는 앞에서부터 차례로 더하므로
+        (x + n*dx와 달리) 상태, 점수, 보상은 step을 반복한 것과 비트 단위로 같다.
+
+        Args:
+            action: 유지할 행동 (0: 왼쪽, 1: 정지, 2: 오른쪽)
+            max_frames: 한 번에 진행할 최대 프레임 수 (None이면 제한 없음)
+
+        반환값:
+        step과 같은 (state, reward, done, info), info['frames']에 진행한 프레임 수
         """
-        게임 화면 렌더링 (render_mode='human'일 때만 작동)
+        # 이벤트 전까지 점수가 그대로이므로 속도도 일정
+        speed_ratio = min(self.score / 1000000, 1.0)
+        speed = self.ball_speed_min + (self.ball_speed_max - self.ball_speed_min) * speed_ratio
+        paddle_speed = self.paddle_speed_min + (self.paddle_speed_max - self.paddle_speed_min) * speed_ratio
+        ball_dx = speed if self.ball_dx > 0 else -speed
+        ball_dy = speed if self.ball_dy > 0 else -speed
+        ball2_dx = speed if self.ball2_dx > 0 else -speed
+        ball2_dy = speed if self.ball2_dy > 0 else -speed
+
+        # 다음 이벤트까지 남은 프레임 수 어림값 (반올림 때문에 1프레임 정도 어긋날 수 있음)
+        frames = self._frames_until_ball_event(self.ball_x, self.ball_y, ball_dx, ball_dy, self.ball1_missed)
+        if self.ball2_active:
+            frames = min(frames, self._frames_until_ball_event(
+                self.ball2_x, self.ball2_y, ball2_dx, ball2_dy, self.ball2_missed))
+        else:
+            frames = min(frames, self._frames_until_ball2())
+
+        # 이벤트가 확실히 없는 구간만 건너뜀
+        skipped = max(frames - 2, 0)
+        if max_frames is not None:
+            skipped = min(skipped, max_frames)
+        self._skip_frames(skipped, action, paddle_speed, ball_dx, ball_dy, ball2_dx, ball2_dy)
+        if max_frames is not None and skipped == max_frames:
+            info = {
+                'score': self.score,
+                'frames': skipped,
+            }
+            return self._get_state(), 0.0, False, info
+
+        # 나머지는 이벤트(방향 전환, 두 번째 공 등장, 득점/실점)가 일어날 때까지 step 규칙 그대로 진행
+        frames = skipped
+        while True:
+            before = self._event_key()
+            state, reward, done, info = self.step(action)
+            frames += 1
+            if done or self._event_key() != before or frames == max_frames:
+                break
+        info['frames'] = frames
+        return state, reward, done, info
+
+    def _event_key(self):
+        """이벤트가 일어나면 바뀌는 값들 (공 방향, 두 번째 공 등장, 점수, 놓친 횟수)"""
+        return (self.ball_dx > 0, self.ball_dy > 0, self.ball2_dx > 0, self.ball2_dy > 0,
+                self.ball2_active, self.score, self.misses)
+
+    @staticmethod
+    def _frames_until_ball_event(x, y, dx, dy, missed):
+        """공 하나가 벽에 닿거나 패들 라인(y >= 0.95)에 도달할 때까지 남은 프레임 수 (어림값)"""
+        # 좌우 벽: x <= 0 또는 x >= 1
+        if dx > 0:
+            frames = math.ceil((1.0 - x) / dx)
+        else:
+            frames = math.ceil(x / -dx)
+        # 위쪽 벽: y <= 0
+        if dy < 0:
+            frames = min(frames, math.ceil(y / -dy))
+        # 패들 라인 (놓친 공은 검사하지 않음)
+        if not missed:
+            if dy > 0:
+                frames = min(frames, math.ceil((0.95 - y) / dy))
+            elif y + dy >= 0.95:
+                frames = 1
+        return max(frames, 1)
+
+    def _frames_until_ball2(self):
+        """두 번째 공이 등장하는 프레임까지 남은 프레임 수 (step과 같은 누적 방식)"""
+        dt = 1.0 / self.target_fps
+        if math.isinf(self.ball2_delay):
+            return math.inf  # 두 번째 공이 나오지 않음 (공 이벤트가 항상 먼저)
+        # 어림값보다 넉넉하게 누적해서 처음으로 딜레이를 넘는 프레임을 찾음
+        count = max(math.ceil((self.ball2_delay - self.ball2_timer) / dt), 0) + 2
+        timers = np.full(count + 1, dt)
+        timers[0] = self.ball2_timer
+        np.add.accumulate(timers, out=timers)
+        return int(np.argmax(timers[1:] >= self.ball2_delay)) + 1
+
+    def _skip_frames(self, frames, action, paddle_speed, ball_dx, ball_dy, ball2_dx, ball2_dy):
         """
-        if self.render_mode != 'human' or self.screen is None:
+        이벤트가 없는 frames 프레임을 한 번에 진행
+        x + n*dx는 n번 더한 값과 반올림이 달라질 수 있어서, [처음 값, 속도, 속도, ...] 열을
+        np.add.accumulate로 앞에서부터 차례로 더함 (step을 반복한 것과 같은 값, 파이썬 반복문 없음)
+        열: 패들x, 공x, 공y, 공2x, 공2y, 공2 타이머
+        """
+        self.ball_dx = ball_dx
+        self.ball_dy = ball_dy
+        self.ball2_dx = ball2_dx
+        self.ball2_dy = ball2_dy
+        if frames <= 0:
             return
+
+        paddle_step = (-paddle_speed, 0.0, paddle_speed)[action]
+        if self.ball2_active:
+            ball2_step, timer_step = (ball2_dx, ball2_dy), 0.0
+        else:
+            ball2_step, timer_step = (0.0, 0.0), 1.0 / self.target_fps
+        values = np.empty((frames + 1, 6))
+        values[0] = (self.paddle_x, self.ball_x, self.ball_y, self.ball2_x, self.ball2_y, self.ball2_timer)
+        values[1:] = (paddle_step, ball_dx, ball_dy) + ball2_step + (timer_step,)
+        np.add.accumulate(values, axis=0, out=values)
+        paddle_x, self.ball_x, self.ball_y, self.ball2_x, self.ball2_y, self.ball2_timer = values[-1].tolist()
+
+        # 패들은 벽에 한 번 닿으면 그 뒤로 계속 0(또는 1)이므로 마지막 값만 잘라도 step과 같음
+        if paddle_x < 0.0:
+            paddle_x = 0.0
+        elif paddle_x > 1.0:
+            paddle_x = 1.0
+        self.paddle_x = paddle_x
+
+
+    # 화면 렌더링 관련 함수
+    def render(self, frame_trace=None, alpha=None):
+        """
+        게임 화면 렌더링 (render_mode='human' 또는 'rgb_array'일 때만 작동)
+        
+        Args:
+            frame_trace: FrameTrace를 주면 그리기/display.flip/clock.tick 구간 시간 기록
+            alpha: 주면 save_positions()로 저장한 직전 위치와 현재 위치 사이를 alpha(0~1) 비율로 보간해서 그림
+                   (FixedTimestep으로 시뮬레이션과 렌더링 속도를 분리할 때)
+        
+        Returns:
+            rgb_array 모드: [세로, 가로, 3] uint8 이미지 (매번 같은 배열을 덮어씀, 보관하려면 복사)
+            그 외: None
+        """
+        if self.render_mode not in ('human', 'rgb_array') or self.screen is None:
+            return None
         
         import pygame
         
-        # 배경
-        self.screen.fill((0, 0, 0))
+        if self.dirty_rects and not self._full_redraw:
+            # 이전 프레임에 그렸던 영역만 지우고 현재 물체를 다시 그림
+            for rect in self._prev_rects:
+                self.screen.fill((0, 0, 0), rect)
+            rects = self._draw_objects(self._render_positions(alpha))
+            dirty = self._prev_rects + rects
+        else:
+            # 배경
+            self.screen.fill((0, 0, 0))
+            rects = self._draw_objects(self._render_positions(alpha))
+            dirty = None
+        self._prev_rects = rects
+        self._full_redraw = False
+        if frame_trace is not None:
+            frame_trace.mark(frame_trace.DRAW)
+        
+        if self.render_mode == 'rgb_array':
+            # 화면 갱신 대신 그린 버퍼의 뷰를 반환 (크기가 다르면 출력 버퍼로 확대/축소)
+            if self._frame is not self.screen:
+                pygame.transform.scale(self.screen, self.render_size, self._frame)
+            return self._frame_array
+
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        if frame_trace is not None:
+            frame_trace.mark(frame_trace.FLIP)
+        
+        if self.clock:
+            self.clock.tick(self.render_fps)
+        if frame_trace is not None:
+            frame_trace.mark(frame_trace.TICK)
+    
+    @staticmethod
+    def _buffer_surface(size):
+        """NumPy 버퍼를 픽셀 메모리로 쓰는 Surface와 그 [세로, 가로, 3] RGB 뷰"""
+        import pygame
+        
+        width, height = size
+        # 바이트 순서를 화면 기본 형식(B, G, R, A)과 맞춰야 글자 blit이 빠름 (RGBX는 10배 이상 느림)
+        buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        surface = pygame.image.frombuffer(buffer, size, 'BGRA')
+        return surface, buffer[:, :, 2::-1]  # B, G, R 순서를 뒤집은 RGB 뷰 (복사 없음)
+    
+    def save_positions(self):
+        """step 전에 호출해서 현재 위치 저장 (render(alpha=...) 보간의 시작점)"""
+        self._prev_positions = (self.ball_x, self.ball_y, self.ball2_x, self.ball2_y, self.paddle_x)
+    
+    def _render_positions(self, alpha):
+        """화면에 그릴 (공x, 공y, 공2x, 공2y, 패들x)"""
+        current = (self.ball_x, self.ball_y, self.ball2_x, self.ball2_y, self.paddle_x)
+        if alpha is None or self._prev_positions is None:
+            return current
+        # 크게 순간이동한 값(다시 나타난 공 등)은 보간하지 않음
+        return tuple(now if abs(now - before) > 0.5 else before + (now - before) * alpha
+                     for before, now in zip(self._prev_positions, current))
+    
+    def _draw_objects(self, positions):
+        """패들, 공, 빨간 공, 점수를 그리고 그린 영역(Rect) 리스트 반환"""
+        import pygame
+        
+        ball_x, ball_y, ball2_x, ball2_y, paddle_x = positions
+        rects = []
         
         # 패들 (아래쪽, 가로로)
-        paddle_pixel_x = int(self.paddle_x * self.width)
+        paddle_pixel_x = int(paddle_x * self.width)
         paddle_pixel_width = int(self.paddle_width * self.width)
-        pygame.draw.rect(self.screen, (255, 255, 255),
-                        (paddle_pixel_x - paddle_pixel_width // 2, self.height - 30,
-                         paddle_pixel_width, 18))
+        rects.append(pygame.draw.rect(self.screen, (255, 255, 255),
+                                      (paddle_pixel_x - paddle_pixel_width // 2, self.height - 30,
+                                       paddle_pixel_width, 18)))
         
         # 공
-        ball_pixel_x = int(self.ball_x * self.width)
-        ball_pixel_y = int(self.ball_y * self.height)
-        pygame.draw.rect(self.screen, (255, 255, 255),
-                        (ball_pixel_x - 7, ball_pixel_y - 7, 15, 15))
+        ball_pixel_x = int(ball_x * self.width)
+        ball_pixel_y = int(ball_y * self.height)
+        rects.append(pygame.draw.rect(self.screen, (255, 255, 255),
+                                      (ball_pixel_x - 7, ball_pixel_y - 7, 15, 15)))
         
         # 두 번째 공 (다른 색, 활성화 시만)
         if self.ball2_active:
-            ball2_pixel_x = int(self.ball2_x * self.width)
-            ball2_pixel_y = int(self.ball2_y * self.height)
-            pygame.draw.rect(self.screen, (0, 255, 255),
-                            (ball2_pixel_x - 7, ball2_pixel_y - 7, 15, 15))
+            ball2_pixel_x = int(ball2_x * self.width)
+            ball2_pixel_y = int(ball2_y * self.height)
+            rects.append(pygame.draw.rect(self.screen, (0, 255, 255),
+                                          (ball2_pixel_x - 7, ball2_pixel_y - 7, 15, 15)))
         
         # 빨간 공 렌더링
         for ball in self.red_balls:
             if ball['active']:
                 ball_pixel_x = int(ball['x'] * self.width)
                 ball_pixel_y = int(ball['y'] * self.height)
-                pygame.draw.circle(self.screen, (255, 0, 0), (ball_pixel_x, ball_pixel_y), 10)
+                rects.append(pygame.draw.circle(self.screen, (255, 0, 0), (ball_pixel_x, ball_pixel_y), 10))
         
-        # 점수 표시
-        score_text = self.font.render(str(self.score), True, (255, 255, 255))
-        self.screen.blit(score_text, (self.width // 2 - 30, 50))
+        # 점수 표시 (점수가 바뀔 때만 글자를 새로 만듦)
+        if self._score_text_value != self.score:
+            self._score_text_surface = self.font.render(str(self.score), True, (255, 255, 255))
+            self._score_text_value = self.score
+        rects.append(self.screen.blit(self._score_text_surface, (self.width // 2 - 30, 50)))
         
         # Miss 횟수 표시
         #miss_text = self.small_font.render(f"Miss: {self.misses}", True, (255, 255, 255))
         #self.screen.blit(miss_text, (self.width - 150, 20))
-
-        pygame.display.flip()
         
-        if self.clock:
-            self.clock.tick(self.target_fps)
+        return rects
     
     def render_game_over(self):
         """게임 오버 화면 렌더링"""
@@ -293,57 +591,243 @@ class PongEnv:
         
         import pygame
         
+        screen = self._game_over_screen()
+        
         # 반투명 오버레이
+        self.screen.blit(screen['overlay'], (0, 0))
+        
+        # GAME OVER 텍스트
+        self.screen.blit(screen['game_over_text'], screen['game_over_rect'])
+        
+        # 최종 점수 표시 (게임 오버마다 한 번만 만듦)
+        score_text = screen['score_font'].render(f"Final Score: {self.score}", True, (255, 255, 255))
+        score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2 - 20))
+        self.screen.blit(score_text, score_rect)
+        
+        # 다시 시작 버튼 (마우스 호버 체크)
+        button_rect = screen['button_rect']
+        self._draw_button(button_rect.collidepoint(pygame.mouse.get_pos()))
+        
+        pygame.display.flip()
+        self._full_redraw = True  # 게임 화면으로 돌아가면 전체를 다시 그려야 함
+        
+        return button_rect
+
+    def _game_over_screen(self):
+        """게임 오버 화면의 오버레이, 폰트, 고정 글자, 버튼 위치 (처음 호출할 때 한 번만 만듦)"""
+        if self._game_over is not None:
+            return self._game_over
+        
+        import pygame
+        
         overlay = pygame.Surface((self.width, self.height))
         overlay.set_alpha(180)
         overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
         
-        # GAME OVER 텍스트
         game_over_font = pygame.font.Font(None, 120)
         game_over_text = game_over_font.render("GAME OVER", True, (255, 50, 50))
-        text_rect = game_over_text.get_rect(center=(self.width // 2, self.height // 2 - 100))
-        self.screen.blit(game_over_text, text_rect)
         
-        # 최종 점수 표시
-        score_font = pygame.font.Font(None, 60)
-        score_text = score_font.render(f"Final Score: {self.score}", True, (255, 255, 255))
-        score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2 - 20))
-        self.screen.blit(score_text, score_rect)
-        
-        # 다시 시작 버튼
         button_width = 250
         button_height = 60
         button_x = self.width // 2 - button_width // 2
         button_y = self.height // 2 + 50
         button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
         
-        # 마우스 호버 체크
-        mouse_pos = pygame.mouse.get_pos()
-        is_hover = button_rect.collidepoint(mouse_pos)
+        button_font = pygame.font.Font(None, 48)
+        button_text = button_font.render("RESTART", True, (0, 0, 0))
         
-        # 버튼 모양
+        self._game_over = {
+            'overlay': overlay,
+            'game_over_text': game_over_text,
+            'game_over_rect': game_over_text.get_rect(center=(self.width // 2, self.height // 2 - 100)),
+            'score_font': pygame.font.Font(None, 60),
+            'button_rect': button_rect,
+            'button_text': button_text,
+            'button_text_rect': button_text.get_rect(center=button_rect.center),
+        }
+        return self._game_over
+    
+    def _draw_button(self, is_hover):
+        """다시 시작 버튼 그리기 (화면 갱신은 호출한 쪽에서)"""
+        import pygame
+        
+        screen = self._game_over_screen()
+        button_rect = screen['button_rect']
         button_color = (100, 255, 100) if is_hover else (50, 200, 50)
         pygame.draw.rect(self.screen, button_color, button_rect, border_radius=15)
         pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 4, border_radius=15)
+        self.screen.blit(screen['button_text'], screen['button_text_rect'])
+        self._button_hover = is_hover
+    
+    def update_game_over_button(self, mouse_pos):
+        """
+        마우스 위치에 따라 버튼의 호버 상태가 바뀌었을 때만 버튼 영역을 다시 그림
+        (render_game_over()로 화면을 한 번 그린 뒤 MOUSEMOTION 이벤트마다 호출)
+        """
+        if self.render_mode != 'human' or self.screen is None:
+            return
         
-        # 버튼 텍스트
-        button_font = pygame.font.Font(None, 48)
-        button_text = button_font.render("RESTART", True, (0, 0, 0))
-        button_text_rect = button_text.get_rect(center=button_rect.center)
-        self.screen.blit(button_text, button_text_rect)
-        
-        pygame.display.flip()
+        import pygame
         
-        return button_rect
+        button_rect = self._game_over_screen()['button_rect']
+        is_hover = button_rect.collidepoint(mouse_pos)
+        if is_hover != self._button_hover:
+            self._draw_button(is_hover)
+            pygame.display.update(button_rect)
 
     def close(self):
         """환경 종료 및 리소스 정리"""
         if self.screen is not None:
             import pygame
+            self._frame = None
+            self._frame_array = None
             pygame.quit()
             self.screen = None
             self.clock = None
+            self._game_over = None  # pygame.quit() 뒤에는 폰트를 다시 만들어야 함
+
+
+class FastPongEnv(PongEnv):
+    """
+    PongEnv와 같은 규칙을 순수 파이썬 float로 계산하는 빠른 엔진
+
+    reset/step/_get_state 사용법은 PongEnv와 동일하고,
+    같은 reset(seed=...)면 PongEnv와 비트 단위로 같은 궤적을 만든다.
+    """
+
+    def reset(self, seed=None):
+        """환경을 초기 상태로 리셋"""
+        state = super().reset(seed)
+        self._speed_score = None
+        return state
+
+    def _update_speed(self):
+        """점수가 바뀔 때만 공/패들 속도를 다시 계산 (점수별 속도 곡선)"""
+        speed_ratio = min(self.score / 1000000, 1.0)
+        self.current_ball_speed = self.ball_speed_min + (self.ball_speed_max - self.ball_speed_min) * speed_ratio
+        self.current_paddle_speed = self.paddle_speed_min + (self.paddle_speed_max - self.paddle_speed_min) * speed_ratio
+        self._speed_score = self.score
+
+    def step(self, action, out=None):
+        """PongEnv.step과 같은 규칙, 같은 반환값"""
+        if self.score != self._speed_score:
+            self._update_speed()
+        speed = self.current_ball_speed
+
+        # 방향 유지 (np.sign 대신 부호만 비교)
+        ball_dx = speed if self.ball_dx > 0 else -speed
+        ball_dy = speed if self.ball_dy > 0 else -speed
+        ball2_dx = speed if self.ball2_dx > 0 else -speed
+        ball2_dy = speed if self.ball2_dy > 0 else -speed
+
+        # 두 번째 공 딜레이 처리
+        ball2_active = self.ball2_active
+        if not ball2_active:
+            self.ball2_timer += 1.0 / self.target_fps
+            if self.ball2_timer >= self.ball2_delay:
+                ball2_active = self.ball2_active = True
+
+        paddle_x = self.paddle_x
+        if action == 0:
+            paddle_x -= self.current_paddle_speed
+        elif action == 2:
+            paddle_x += self.current_paddle_speed
+
+        # 패들이 화면 밖으로 나가지 않도록 제한 (np.clip과 같은 결과)
+        if paddle_x < 0.0:
+            paddle_x = 0.0
+        elif paddle_x > 1.0:
+            paddle_x = 1.0
+        self.paddle_x = paddle_x
+
+        # 공 이동
+        ball_x = self.ball_x + ball_dx
+        ball_y = self.ball_y + ball_dy
+        ball2_x = self.ball2_x
+        ball2_y = self.ball2_y
+        if ball2_active:
+            ball2_x += ball2_dx
+            ball2_y += ball2_dy
+
+        reward = 0.0
+        done = False
+
+        # 좌우/위쪽 벽 충돌
+        if ball_x <= 0.0 or ball_x >= 1.0:
+            ball_dx = -ball_dx
+        if ball_y <= 0.0:
+            ball_dy = -ball_dy
+        if ball2_active:
+            if ball2_x <= 0.0 or ball2_x >= 1.0:
+                ball2_dx = -ball2_dx
+            if ball2_y <= 0.0:
+                ball2_dy = -ball2_dy
+
+        # 패들 충돌 및 점수
+        half_width = self.paddle_width / 2
+        if ball_y >= 0.95 and not self.ball1_missed:
+            if abs(ball_x - paddle_x) <= half_width:
+                ball_dy = -ball_dy
+                # x방향 랜덤화 (PongEnv와 같은 순서로 난수 소비)
+                ball_dx = self._random_sign() * abs(ball_dx)
+                self.score += 1
+                reward += 1.0
+                if self.score > 10000 and self._random_uniform() < 0.000001:
+                    done = True
+            else:
+                self.misses += 1
+                reward -= 1.0
+                self.ball1_missed = True
+
+        if ball2_active and ball2_y >= 0.95 and not self.ball2_missed:
+            if abs(ball2_x - paddle_x) <= half_width:
+                ball2_dy = -ball2_dy
+                ball2_dx = self._random_sign() * abs(ball2_dx)
+                self.score += 1
+                reward += 1.0
+                if self.score > 10000 and self._random_uniform() < 0.000001:
+                    done = True
+            else:
+                self.misses += 1
+                reward -= 1.0
+                self.ball2_missed = True
+
+        self.ball_x = ball_x
+        self.ball_y = ball_y
+        self.ball_dx = ball_dx
+        self.ball_dy = ball_dy
+        self.ball2_x = ball2_x
+        self.ball2_y = ball2_y
+        self.ball2_dx = ball2_dx
+        self.ball2_dy = ball2_dy
+
+        # 두 공 모두 놓쳐야 게임오버
+        if self.ball1_missed and self.ball2_missed:
+            done = True
+
+        info = {
+            'score': self.score,
+        }
+
+        return self._get_state(out), reward, done, info
+
+
+def make_seeded_envs(num_envs, seed, env_cls=PongEnv, **kwargs):
+    """
+    시드 하나로 서로 독립적인 난수 스트림을 가진 환경 여러 개 생성
+
+    Args:
+        num_envs: 환경 개수
+        seed: 전체 평가에 쓸 시드 (같은 시드면 모든 환경이 같은 게임을 반복)
+        env_cls: PongEnv 또는 FastPongEnv
+        kwargs: 환경 생성자에 그대로 전달
+    """
+    envs = []
+    for child_seed in np.random.SeedSequence(seed).spawn(num_envs):
+        env = env_cls(**kwargs)
+        env.seed(child_seed)
+        envs.append(env)
+    return envs
 
 
 # ====================================================================
@@ -398,19 +882,24 @@ if __name__ == "__main__":
         
         # 게임 종료 시 리셋
         if done:
-            # GAME OVER 화면 표시 및 버튼 대기
+            # GAME OVER 화면 표시 (한 번만 그림) 및 버튼 대기
+            # 이벤트가 올 때까지 잠들어 있다가 호버 상태가 바뀌면 버튼만 다시 그림
+            button_rect = env.render_game_over()
             waiting = True
             while waiting:
-                button_rect = env.render_game_over()
-                
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
+                event = pygame.event.wait()
+                if event.type == pygame.QUIT:
+                    running = False
+                    waiting = False
+                elif event.type == pygame.MOUSEMOTION:
+                    env.update_game_over_button(event.pos)
+                # 마우스 클릭 체크
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if button_rect and button_rect.collidepoint(event.pos):
                         waiting = False
-                    # 마우스 클릭 체크
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if button_rect and button_rect.collidepoint(event.pos):
-                            waiting = False
+                # 창이 다시 보이게 되면 화면 전체 갱신
+                elif event.type == pygame.VIDEOEXPOSE:
+                    pygame.display.flip()
             
             print(f"\n게임 종료! 총 스텝: {steps}, 총 보상: {total_reward:.2f}")
             print(f"최종 점수 - Score: {info['score']}")